@@ -0,0 +1,405 @@
+"""
+In-memory profile cache: TTL per entry, LRU eviction (entries and approximate bytes)
+and single-flight so concurrent requests for the same user share one GitHub fan-out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "512"))
+PROFILE_CACHE_MAX_BYTES = int(os.getenv("PROFILE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Perfiles incompletos ("degraded": plazo vencido o presupuesto bajo) caducan antes
+PROFILE_CACHE_PARTIAL_TTL = float(os.getenv("PROFILE_CACHE_PARTIAL_TTL", "30"))
+
+
+def normalize_username(username: str) -> str:
+    """GitHub logins are case-insensitive."""
+    return (username or "").strip().lower()
+
+
+def _approx_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "expired")
+
+    def __init__(self, value: Any, size: int, expires_at: float) -> None:
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        # Ya contada en ``expirations``
+        self.expired = False
+
+
+class ProfileCache:
+    """Bounded TTL + LRU cache of assembled profile dicts.
+
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttl: float = PROFILE_CACHE_TTL,
+        max_entries: int = PROFILE_CACHE_MAX_ENTRIES,
+        max_bytes: int = PROFILE_CACHE_MAX_BYTES,
+        partial_ttl: float = PROFILE_CACHE_PARTIAL_TTL,
+    ) -> None:
+        self.ttl = ttl
+        self.partial_ttl = min(partial_ttl, ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_served = 0
+        self.refreshes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, username: str) -> Optional[Any]:
+        key = normalize_username(username)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            # Se conserva (hasta que la expulse el LRU) para servirla si GitHub no está disponible;
+            # cada caducidad se cuenta una vez, no en cada consulta
+            if not entry.expired:
+                entry.expired = True
+                self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def get_stale(self, username: str) -> Optional[Any]:
+        """Entry regardless of TTL (None if it was already evicted)."""
+        entry = self._entries.get(normalize_username(username))
+        return entry.value if entry is not None else None
+
+    def expires_in(self, username: str) -> Optional[float]:
+        """Seconds until the entry expires (negative once expired); None if absent."""
+        entry = self._entries.get(normalize_username(username))
+        return entry.expires_at - time.monotonic() if entry is not None else None
+
+    def set(self, username: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        key = normalize_username(username)
+        size = _approx_size(value)
+        if self.max_bytes > 0 and size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        partial = isinstance(value, dict) and bool(value.get("degraded"))
+        ttl = self.partial_ttl if partial else self.ttl
+        self._entries[key] = _Entry(value, size, time.monotonic() + ttl)
+        self._bytes += size
+        self._evict()
+
+    def invalidate(self, username: str) -> None:
+        self._remove(normalize_username(username))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    async def get_or_fetch(
+        self,
+        username: str,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        prefer_stale: bool = False,
+        stale_if: Optional[Callable[[BaseException], bool]] = None,
+    ) -> Any:
+        """Return the cached profile or run ``fetch`` once for all concurrent callers.
+
+        ``prefer_stale`` serves an expired entry instead of fetching; ``stale_if``
+        decides which fetch errors fall back to an expired entry.
+        """
+        key = normalize_username(username)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        if prefer_stale:
+            stale = self.get_stale(key)
+            if stale is not None:
+                self.stale_served += 1
+                return stale
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # La descarga corre en su propia tarea: si el cliente que la inició se
+            # desconecta, los demás que esperan el mismo usuario no se cancelan.
+            task = asyncio.ensure_future(self._fill(key, fetch))
+            self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        except Exception as exc:
+            if stale_if is not None and stale_if(exc):
+                stale = self.get_stale(key)
+                if stale is not None:
+                    self.stale_served += 1
+                    return stale
+            raise
+
+    async def refresh(self, username: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Fetch and store ``username`` even if cached; joins an in-flight fetch instead of starting another."""
+        key = normalize_username(username)
+        task = self._inflight.get(key)
+        if task is None:
+            self.refreshes += 1
+            task = asyncio.ensure_future(self._fill(key, fetch))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "partial_ttl": self.partial_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "inflight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_RESPONSE_CACHE_MAX_ENTRIES", "4096"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("GITHUB_RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Segundos durante los que una respuesta guardada se usa sin revalidar (0 = siempre revalidar)
+RESPONSE_FRESH_TTL = float(os.getenv("GITHUB_RESPONSE_FRESH_TTL", "0"))
+
+
+class StoredResponse:
+    __slots__ = ("etag", "last_modified", "body", "size", "stored_at")
+
+    def __init__(
+        self,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body: Any,
+        size: int,
+        stored_at: Optional[float] = None,
+    ) -> None:
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.size = size
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseStore:
+    """Validators (ETag / Last-Modified) and parsed body per GitHub URL.
+
+    Lets the client send conditional requests: a 304 reuses the stored body and
+    does not count against the GitHub rate limit. An optional ``disk`` tier
+    (app.disk_cache.DiskResponseStore) backs the in-memory LRU so validators
+    survive restarts and are shared across workers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        fresh_ttl: float = RESPONSE_FRESH_TTL,
+        disk: Any = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.fresh_ttl = fresh_ttl
+        self.disk = disk
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._bytes = 0
+        self.revalidated = 0
+        self.bytes_saved = 0
+        self.fresh_hits = 0
+        self.stored = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: StoredResponse) -> None:
+        if self.max_entries <= 0 or not (entry.etag or entry.last_modified):
+            return
+        if self.max_bytes > 0 and entry.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self.stored += 1
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def mark_revalidated(self, entry: StoredResponse) -> None:
+        self.revalidated += 1
+        self.bytes_saved += entry.size
+        entry.stored_at = time.time()
+
+    async def lookup(self, key: str) -> Optional[StoredResponse]:
+        """Memory first, then the disk tier (promoting the row into memory)."""
+        entry = self.get(key)
+        if entry is None and self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                self.put(key, entry)
+        return entry
+
+    async def save(self, key: str, entry: StoredResponse) -> None:
+        if not (entry.etag or entry.last_modified):
+            return
+        self.put(key, entry)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.put, key, entry)
+
+    async def revalidated_entry(self, key: str, entry: StoredResponse) -> None:
+        self.mark_revalidated(entry)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.touch, key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "stored": self.stored,
+            "revalidated": self.revalidated,
+            "bytes_saved": self.bytes_saved,
+            "fresh_hits": self.fresh_hits,
+            "fresh_ttl": self.fresh_ttl,
+            "evictions": self.evictions,
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+LANGUAGE_SNAPSHOT_MAX_ENTRIES = int(os.getenv("GITHUB_LANGUAGE_SNAPSHOT_MAX_ENTRIES", "20000"))
+
+
+class LanguageSnapshotStore:
+    """Language byte map per (repo full name, pushed_at).
+
+    A repo's languages only change when it is pushed, so a refresh can reuse
+    these maps and call languages_url just for repos with a new pushed_at.
+    """
+
+    def __init__(self, max_entries: int = LANGUAGE_SNAPSHOT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, int]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict[str, int]]:
+        name, pushed_at = key
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != pushed_at:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple[str, str], languages: Dict[str, int]) -> None:
+        if self.max_entries <= 0:
+            return
+        name, pushed_at = key
+        # Una entrada por repo: el snapshot de un pushed_at anterior se reemplaza
+        self._entries.pop(name, None)
+        self._entries[name] = (pushed_at, languages)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
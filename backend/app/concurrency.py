@@ -0,0 +1,138 @@
+"""
+Global AIMD concurrency limiter for outgoing GitHub requests.
+
+Shared by every in-flight profile: the limit grows by ~1 per window of fast
+successful responses and is cut multiplicatively on 403/429/5xx, timeouts or
+latency well above target, so a lone request gets wide fan-out while a burst
+of profiles cannot stampede GitHub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+INITIAL_LIMIT = float(os.getenv("GITHUB_CONCURRENCY_INITIAL", "16"))
+MIN_LIMIT = float(os.getenv("GITHUB_CONCURRENCY_MIN", "2"))
+MAX_LIMIT = float(os.getenv("GITHUB_CONCURRENCY_MAX", "64"))
+TARGET_LATENCY = float(os.getenv("GITHUB_CONCURRENCY_TARGET_LATENCY", "1.0"))
+BACKOFF = 0.5
+# Tras un recorte, no se vuelve a recortar durante este tiempo (una ráfaga de errores = un recorte)
+DECREASE_COOLDOWN = 1.0
+
+OVERLOAD_STATUSES = frozenset({403, 429, 500, 502, 503, 504})
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        initial: float = INITIAL_LIMIT,
+        min_limit: float = MIN_LIMIT,
+        max_limit: float = MAX_LIMIT,
+        target_latency: float = TARGET_LATENCY,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = max(min_limit, min(initial, max_limit))
+        self.target_latency = target_latency
+        self.inflight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.max_waiters = 0
+
+    async def acquire(self) -> None:
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_waiters = max(self.max_waiters, len(self._waiters))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Ya se nos había cedido el hueco: lo pasamos al siguiente
+                self.inflight -= 1
+                self._wake()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, latency: float, status: Optional[int], *, cancelled: bool = False) -> None:
+        self.inflight -= 1
+        # Cancelada desde fuera (plazo vencido, perfil abandonado): no dice nada de GitHub
+        if not cancelled:
+            if status is None or status in OVERLOAD_STATUSES or latency > self.target_latency * 2:
+                self._decrease()
+            elif latency <= self.target_latency:
+                self._increase()
+        self._wake()
+
+    def _increase(self) -> None:
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self.increases += 1
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * BACKOFF)
+        self.decreases += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.inflight += 1
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator["_Slot"]:
+        """``async with limiter.slot() as slot: ...; slot.status = response.status_code``.
+
+        Leaving without a status (exception) counts as an overload signal;
+        a cancelled request frees its slot without moving the limit.
+        """
+        await self.acquire()
+        slot = _Slot()
+        started = time.monotonic()
+        cancelled = False
+        try:
+            yield slot
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            self.release(time.monotonic() - started, slot.status, cancelled=cancelled)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "target_latency": self.target_latency,
+            "inflight": self.inflight,
+            "waiting": len(self._waiters),
+            "max_waiting": self.max_waiters,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class _Slot:
+    __slots__ = ("status",)
+
+    def __init__(self) -> None:
+        self.status: Optional[int] = None
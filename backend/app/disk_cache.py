@@ -0,0 +1,190 @@
+"""
+On-disk tier for GitHub responses (SQLite in WAL mode).
+
+Survives restarts and is shared by every uvicorn worker on the host: WAL lets
+readers in all processes proceed while one process writes. Rows hold the raw
+JSON body and validators per URL; eviction keeps the file under a byte budget.
+
+Compaction (evict to budget + VACUUM):
+
+    python -m app.disk_cache compact [path]
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.cache import StoredResponse
+from app.jsonutil import dumps, loads
+
+DISK_CACHE_PATH = os.getenv("GITHUB_DISK_CACHE_PATH", "")
+DISK_CACHE_MAX_BYTES = int(os.getenv("GITHUB_DISK_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Cada cuántas escrituras se comprueba el presupuesto de bytes
+EVICT_EVERY = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class DiskResponseStore:
+    """SQLite-backed store of StoredResponse rows keyed by URL."""
+
+    def __init__(self, path: str, max_bytes: int = DISK_CACHE_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT etag, last_modified, body, size, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            etag, last_modified, body, size, stored_at = row
+            self.hits += 1
+            return StoredResponse(etag, last_modified, loads(body), size, stored_at=stored_at)
+        except (sqlite3.Error, ValueError):
+            self.errors += 1
+            return None
+
+    def put(self, key: str, entry: StoredResponse) -> None:
+        try:
+            body = dumps(entry.body).decode("utf-8")
+            now = time.time()
+            self._conn().execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, etag, last_modified, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.etag, entry.last_modified, body, len(body), entry.stored_at, now),
+            )
+        except (sqlite3.Error, TypeError, ValueError):
+            self.errors += 1
+            return
+        self._writes += 1
+        if self._writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def touch(self, key: str) -> None:
+        """Refresh stored_at after a 304 so freshness is shared with other workers."""
+        try:
+            now = time.time()
+            self._conn().execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+        except sqlite3.Error:
+            self.errors += 1
+
+    def total_bytes(self) -> int:
+        row = self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return int(row[0])
+
+    def evict(self) -> int:
+        """Delete least recently accessed rows until the store fits in max_bytes."""
+        if self.max_bytes <= 0:
+            return 0
+        try:
+            conn = self._conn()
+            excess = self.total_bytes() - self.max_bytes
+            if excess <= 0:
+                return 0
+            freed = 0
+            victims = []
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+                if freed >= excess:
+                    break
+                victims.append((key,))
+                freed += size
+            conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            return len(victims)
+        except sqlite3.Error:
+            self.errors += 1
+            return 0
+
+    def compact(self) -> Dict[str, int]:
+        removed = self.evict()
+        conn = self._conn()
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {"removed": removed, "bytes": self.total_bytes()}
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            count, total = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        except sqlite3.Error:
+            count, total = None, None
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+def open_disk_store(path: str = DISK_CACHE_PATH) -> Optional[DiskResponseStore]:
+    if not path:
+        return None
+    try:
+        return DiskResponseStore(path)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] != "compact":
+        print("usage: python -m app.disk_cache compact [path]", file=sys.stderr)
+        return 2
+    path = argv[1] if len(argv) > 1 else DISK_CACHE_PATH
+    if not path:
+        print("GITHUB_DISK_CACHE_PATH is not set", file=sys.stderr)
+        return 2
+    result = DiskResponseStore(path).compact()
+    print(f"removed={result['removed']} bytes={result['bytes']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,19 +1,76 @@
 import asyncio
 import os
-from typing import Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 from fastapi import HTTPException
 
-GITHUB_API = "https://api.github.com"
+from app.cache import LanguageSnapshotStore, ResponseStore, StoredResponse
+from app.concurrency import AdaptiveLimiter
+from app.disk_cache import open_disk_store
+from app.github_graphql import fetch_profile_graphql
+from app.jsonutil import dumps, loads
+from app.metrics import count_github_calls, deadline_misses, record_github_call, stage
+from app.rate_limit import RATE_LIMIT_DETAIL, RateLimitExceeded, RateLimitGovernor
+from app.repo_record import RepoRecord, project_page, summarize_repos
+from app.tokens import TokenPool
+from app.tracing import span
+
+GITHUB_API = os.getenv("GITHUB_API", "https://api.github.com").rstrip("/")
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API}/graphql")
+# "rest" (por defecto) o "graphql"; GraphQL requiere GITHUB_TOKEN
+FETCH_BACKEND = os.getenv("GITHUB_FETCH_BACKEND", "rest").strip().lower()
+GRAPHQL_LANGUAGES_PER_REPO = int(os.getenv("GITHUB_GRAPHQL_LANGUAGES_PER_REPO", "100"))
 REQUEST_TIMEOUT = httpx.Timeout(20.0, connect=10.0)
 MAX_REPOS = int(os.getenv("GITHUB_MAX_REPOS", "100"))
 LANGUAGE_REPO_LIMIT = int(os.getenv("GITHUB_LANGUAGE_REPO_LIMIT", "30"))
 REPO_RESULT_LIMIT = int(os.getenv("GITHUB_REPO_RESULT_LIMIT", "12"))
+# Llamadas languages_url simultáneas de un mismo perfil (reparto justo del límite global)
+PROFILE_LANGUAGE_CONCURRENCY = int(os.getenv("GITHUB_PROFILE_LANGUAGE_CONCURRENCY", "8"))
+# Páginas de repos de un mismo perfil pedidas a la vez (conocido public_repos)
+PROFILE_REPO_PAGE_CONCURRENCY = int(os.getenv("GITHUB_PROFILE_REPO_PAGE_CONCURRENCY", "4"))
+# Tamaño fijo de página: así cualquier página se puede pedir sin conocer las anteriores
+REPO_PAGE_SIZE = max(1, min(100, MAX_REPOS))
+
+# Plazos por perfil en segundos (0 = sin plazo). Al vencer el de una etapa se usa lo que
+# haya llegado y el perfil sale marcado en "degraded"; sin usuario no hay perfil (504)
+PROFILE_DEADLINE = float(os.getenv("GITHUB_PROFILE_DEADLINE", "10"))
+USER_DEADLINE = float(os.getenv("GITHUB_USER_DEADLINE", "5"))
+REPOS_DEADLINE = float(os.getenv("GITHUB_REPOS_DEADLINE", "5"))
+LANGUAGES_DEADLINE = float(os.getenv("GITHUB_LANGUAGES_DEADLINE", "4"))
+TIMEOUT_DETAIL = "GitHub API did not answer in time. Try again in a moment."
+
+# Pool de conexiones del cliente compartido (ver create_client)
+HTTP2_ENABLED = os.getenv("GITHUB_HTTP2", "1").lower() not in ("0", "false", "no")
+MAX_CONNECTIONS = int(os.getenv("GITHUB_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GITHUB_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("GITHUB_KEEPALIVE_EXPIRY", "30"))
+
+
+# Recibe ("user" | "repos", perfil parcial) a medida que llegan las partes del perfil
+ProgressCallback = Callable[[str, dict], None]
 
 
-def _headers() -> Dict[str, str]:
-    token = os.getenv("GITHUB_TOKEN")
+# Validadores (ETag/Last-Modified) por URL para peticiones condicionales;
+# con GITHUB_DISK_CACHE_PATH se comparten en disco entre workers y reinicios
+response_store = ResponseStore(disk=open_disk_store())
+# Presupuesto de rate limit observado por token y recurso (core / graphql)
+rate_limiter = RateLimitGovernor()
+# GITHUB_TOKENS / GITHUB_TOKENS_FILE / GITHUB_TOKEN; cada petición usa el token con más presupuesto
+token_pool = TokenPool.from_env(rate_limiter)
+# Límite global y adaptativo (AIMD) de peticiones simultáneas a GitHub
+github_limiter = AdaptiveLimiter()
+# Mapa de lenguajes por (repo, pushed_at): solo se piden de nuevo los repos con push nuevo
+language_snapshots = LanguageSnapshotStore()
+
+
+def budget_is_low() -> bool:
+    """True when the REST budget is nearly spent: callers should degrade instead of fetching."""
+    return token_pool.is_low()
+
+
+def _headers(token: Optional[str]) -> Dict[str, str]:
     headers = {
         "Accept": "application/vnd.github+json",
         "User-Agent": "readme-generator",
@@ -24,13 +81,101 @@ def _headers() -> Dict[str, str]:
     return headers
 
 
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_client() -> httpx.AsyncClient:
+    """Process-wide GitHub client: keeps TLS connections alive between profile requests."""
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        timeout=REQUEST_TIMEOUT,
+        limits=limits,
+        http2=HTTP2_ENABLED and _http2_available(),
+    )
+
+
+async def _conditional_get(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict[str, object]] = None,
+    project: Optional[Callable[[Any], Any]] = None,
+) -> Tuple[httpx.Response, object]:
+    """GET with If-None-Match / If-Modified-Since; a 304 returns the stored body.
+
+    The body is None for error responses; callers inspect the status code.
+    ``project`` reduces the parsed body before it is stored and returned.
+    """
+    key = str(httpx.URL(url, params=params))
+    with span("github_request", **{"http.url": key}) as current:
+        stored = await response_store.lookup(key)
+        if stored is not None and project is not None:
+            # Las filas antiguas del disco pueden traer el JSON completo
+            stored.body = project(stored.body)
+        if stored is not None and stored.is_fresh(response_store.fresh_ttl):
+            response_store.fresh_hits += 1
+            if current is not None:
+                current.set("cache", "fresh")
+            return httpx.Response(200, request=httpx.Request("GET", key)), stored.body
+        token = token_pool.select()
+        headers = _headers(token)
+        if stored is not None:
+            headers.update(stored.conditional_headers())
+
+        budget_key = token_pool.budget_key(token)
+        await rate_limiter.acquire(budget_key)
+        async with github_limiter.slot() as slot:
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.HTTPError:
+                record_github_call("error")
+                raise
+            slot.status = response.status_code
+        record_github_call(response.status_code)
+        if current is not None:
+            current.set("http.status_code", response.status_code)
+        rate_limiter.observe(budget_key, response)
+        if response.status_code == 304 and stored is not None:
+            await response_store.revalidated_entry(key, stored)
+            return response, stored.body
+        if response.status_code >= 400:
+            return response, None
+
+        body = loads(response.content)
+        size = len(response.content)
+        if project is not None:
+            body = project(body)
+            size = len(dumps(body))
+        await response_store.save(
+            key,
+            StoredResponse(
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                body=body,
+                size=size,
+            ),
+        )
+        return response, body
+
+
 async def _get_json(
     client: httpx.AsyncClient,
     url: str,
     params: Optional[Dict[str, object]] = None,
+    project: Optional[Callable[[Any], Any]] = None,
 ):
     try:
-        response = await client.get(url, params=params)
+        response, body = await _conditional_get(client, url, params=params, project=project)
+    except RateLimitExceeded as exc:
+        raise HTTPException(status_code=403, detail=RATE_LIMIT_DETAIL) from exc
     except httpx.HTTPError as exc:
         raise HTTPException(
             status_code=502,
@@ -40,13 +185,10 @@ async def _get_json(
     if response.status_code >= 400:
         detail = None
         try:
-            body = response.json()
-            detail = body.get("message") or response.text
+            error_body = loads(response.content)
+            detail = error_body.get("message") or response.text
             if response.status_code == 403 and "rate limit" in (detail or "").lower():
-                detail = (
-                    "Límite de la API de GitHub alcanzado. "
-                    "Configura GITHUB_TOKEN en tu .env (token de GitHub con permisos de lectura) y reinicia el backend para aumentar el límite."
-                )
+                detail = RATE_LIMIT_DETAIL
         except ValueError:
             detail = response.text
 
@@ -54,64 +196,196 @@ async def _get_json(
             raise HTTPException(status_code=404, detail="GitHub user not found")
         raise HTTPException(status_code=response.status_code, detail=detail or "GitHub API error")
 
-    return response.json()
+    return body
 
 
-async def _fetch_repos(client: httpx.AsyncClient, username: str) -> List[dict]:
-    repos: List[dict] = []
-    page = 1
+def _stage_timeout(deadline: Optional[float], limit: float) -> Optional[float]:
+    """Seconds a stage may take: its own limit, capped by what is left of the profile deadline."""
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    if limit <= 0:
+        return remaining
+    return limit if remaining is None else min(limit, remaining)
 
-    while len(repos) < MAX_REPOS:
-        per_page = min(100, MAX_REPOS - len(repos))
-        params = {
-            "per_page": per_page,
-            "page": page,
-            "sort": "updated",
-            "direction": "desc",
-            "type": "owner",
-        }
-        batch = await _get_json(client, f"{GITHUB_API}/users/{username}/repos", params=params)
-        if not isinstance(batch, list) or not batch:
-            break
-        repos.extend(batch)
-        if len(batch) < per_page:
+
+async def _wait_in_order(tasks: List[asyncio.Future], timeout: Optional[float]) -> Tuple[List, bool]:
+    """Results of ``tasks`` up to the first one not finished within ``timeout``; the rest are cancelled.
+
+    Returns ``(results, complete)``. An exception in any task is raised.
+    Cancelled calls release their limiter slot without cutting the limit.
+    """
+    if not tasks:
+        return [], True
+    done, pending = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION)
+    for task in pending:
+        task.cancel()
+    for task in tasks:
+        if task in done and task.exception() is not None:
+            raise task.exception()  # type: ignore[misc]
+    results = []
+    for task in tasks:
+        if task not in done:
             break
-        page += 1
+        results.append(task.result())
+    return results, not pending
+
+
+def _discard_result(task: asyncio.Future) -> None:
+    # Recoge el resultado de tareas que ya nadie espera (evita "exception was never retrieved")
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_repo_page(client: httpx.AsyncClient, username: str, page: int) -> List[RepoRecord]:
+    params = {
+        "per_page": REPO_PAGE_SIZE,
+        "page": page,
+        "sort": "updated",
+        "direction": "desc",
+        "type": "owner",
+    }
+    with span("github_repos_page", page=page):
+        return await _get_json(
+            client,
+            f"{GITHUB_API}/users/{username}/repos",
+            params=params,
+            project=project_page,
+        )
+
+
+async def _fetch_repos(
+    client: httpx.AsyncClient,
+    username: str,
+    public_repos: Optional[int] = None,
+    first_page: Optional[Awaitable[List[RepoRecord]]] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[List[RepoRecord], bool]:
+    """Up to MAX_REPOS repos in ``sort=updated`` order, and whether all of them arrived.
 
-    return repos
+    With the user's ``public_repos`` count, every page after the first is
+    requested at once (at most PROFILE_REPO_PAGE_CONCURRENCY in flight) and the
+    pages are merged in order. If the count was stale and the last page came
+    back full, the remaining pages are walked one by one. Pages still missing
+    after ``timeout`` seconds are dropped (with everything after them).
+    """
+    if MAX_REPOS <= 0:
+        return [], True
+    expires_at = None if timeout is None else time.monotonic() + timeout
 
+    def left() -> Optional[float]:
+        return None if expires_at is None else max(0.0, expires_at - time.monotonic())
 
-async def _fetch_languages(client: httpx.AsyncClient, repos: List[dict]) -> Dict[str, int]:
+    if first_page is None:
+        first_page = _fetch_repo_page(client, username, 1)
+    pages, complete = await _wait_in_order([asyncio.ensure_future(first_page)], left())
+
+    if complete and len(pages[0]) == REPO_PAGE_SIZE and isinstance(public_repos, int):
+        wanted = min(public_repos, MAX_REPOS)
+        last_page = -(-wanted // REPO_PAGE_SIZE)
+        semaphore = asyncio.Semaphore(max(1, PROFILE_REPO_PAGE_CONCURRENCY))
+
+        async def fetch_page(page: int) -> List[RepoRecord]:
+            async with semaphore:
+                return await _fetch_repo_page(client, username, page)
+
+        tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, last_page + 1)]
+        more, complete = await _wait_in_order(tasks, left())
+        pages.extend(more)
+
+    # Sin contador (o desactualizado): se sigue página a página
+    while complete and len(pages[-1]) == REPO_PAGE_SIZE and len(pages) * REPO_PAGE_SIZE < MAX_REPOS:
+        task = asyncio.ensure_future(_fetch_repo_page(client, username, len(pages) + 1))
+        more, complete = await _wait_in_order([task], left())
+        pages.extend(more)
+
+    repos = [repo for page in pages for repo in page]
+    return repos[:MAX_REPOS], complete
+
+
+def _snapshot_key(repo: RepoRecord) -> Optional[Tuple[str, str]]:
+    name = repo.full_name or repo.languages_url
+    pushed_at = repo.pushed_at
+    if not name or not pushed_at:
+        return None
+    return name, pushed_at
+
+
+async def _fetch_languages(
+    client: httpx.AsyncClient,
+    repos: List[RepoRecord],
+    timeout: Optional[float] = None,
+) -> Tuple[Dict[str, int], bool]:
+    """Byte totals per language and whether every repo was counted.
+
+    Repos whose pushed_at did not change reuse their stored language map; only
+    the rest call languages_url. With a nearly spent rate limit those calls are
+    skipped and the totals come from snapshots alone (complete=False). Calls
+    that fail or miss ``timeout`` are left out of the totals (complete=False).
+    """
     lang_totals: Dict[str, int] = {}
     if not repos:
-        return lang_totals
+        return lang_totals, True
+
+    lang_maps: List[Dict[str, int]] = []
+    pending: List[Tuple[RepoRecord, Optional[Tuple[str, str]]]] = []
+    for repo in repos:
+        key = _snapshot_key(repo)
+        snapshot = language_snapshots.get(key) if key else None
+        if snapshot is not None:
+            lang_maps.append(snapshot)
+        else:
+            pending.append((repo, key))
+
+    complete = True
+    if pending and budget_is_low():
+        rate_limiter.languages_skipped += 1
+        pending = []
+        complete = False
 
-    semaphore = asyncio.Semaphore(5)
+    semaphore = asyncio.Semaphore(PROFILE_LANGUAGE_CONCURRENCY)
 
-    async def fetch_repo_langs(repo: dict) -> Dict[str, int]:
-        url = repo.get("languages_url")
+    async def fetch_repo_langs(repo: RepoRecord, key: Optional[Tuple[str, str]]) -> Optional[Dict[str, int]]:
+        # None = la llamada falló y los totales quedan incompletos
+        url = repo.languages_url
         if not url:
             return {}
         async with semaphore:
             try:
-                response = await client.get(url)
-            except httpx.HTTPError:
-                return {}
-        if response.status_code >= 400:
-            return {}
-        try:
-            data = response.json()
-        except ValueError:
+                with span("github_languages_call", repo=repo.full_name or ""):
+                    response, data = await _conditional_get(client, url)
+            except (httpx.HTTPError, RateLimitExceeded, ValueError):
+                return None
+        if response.status_code == 404:
+            # Repo borrado entre la página de repos y esta llamada: no aporta bytes
             return {}
-        return data if isinstance(data, dict) else {}
+        if response.status_code >= 400 or not isinstance(data, dict):
+            return None
+        if key is not None:
+            language_snapshots.put(key, data)
+        return data
 
-    tasks = [fetch_repo_langs(repo) for repo in repos]
-    for lang_map in await asyncio.gather(*tasks):
+    tasks = [asyncio.ensure_future(fetch_repo_langs(repo, key)) for repo, key in pending]
+    if tasks:
+        done, late = await asyncio.wait(tasks, timeout=timeout)
+        for task in tasks:
+            if task not in done:
+                continue
+            lang_map = task.result()
+            if lang_map is None:
+                complete = False
+            else:
+                lang_maps.append(lang_map)
+        if late:
+            # Las que no llegaron siguen en segundo plano y guardan su snapshot para el próximo refresco
+            deadline_misses.inc(stage="languages")
+            complete = False
+            for task in late:
+                task.add_done_callback(_discard_result)
+    for lang_map in lang_maps:
         for language, amount in lang_map.items():
             if isinstance(amount, int):
                 lang_totals[language] = lang_totals.get(language, 0) + amount
 
-    return lang_totals
+    return lang_totals, complete
 
 
 def _build_language_list(lang_totals: Dict[str, int]) -> List[dict]:
@@ -126,56 +400,158 @@ def _build_language_list(lang_totals: Dict[str, int]) -> List[dict]:
     return languages
 
 
-def _format_repo(repo: dict) -> dict:
+def _format_repo(repo: RepoRecord) -> dict:
     return {
-        "name": repo.get("name"),
-        "url": repo.get("html_url"),
-        "description": repo.get("description"),
-        "stars": repo.get("stargazers_count", 0),
-        "forks": repo.get("forks_count", 0),
-        "language": repo.get("language"),
-        "updated_at": repo.get("pushed_at") or repo.get("updated_at"),
-        "is_fork": repo.get("fork", False),
+        "name": repo.name,
+        "url": repo.html_url,
+        "description": repo.description,
+        "stars": repo.stargazers_count,
+        "forks": repo.forks_count,
+        "language": repo.language,
+        "updated_at": repo.pushed_at or repo.updated_at,
+        "is_fork": repo.fork,
     }
 
 
-async def fetch_profile_data(username: str) -> dict:
-    async with httpx.AsyncClient(headers=_headers(), timeout=REQUEST_TIMEOUT) as client:
-        user = await _get_json(client, f"{GITHUB_API}/users/{username}")
-        repos = await _fetch_repos(client, username)
-
-        owned_repos = [repo for repo in repos if not repo.get("fork")]
-        if not owned_repos:
-            owned_repos = repos
-
-        repos_for_languages = owned_repos[:LANGUAGE_REPO_LIMIT]
-        lang_totals = await _fetch_languages(client, repos_for_languages)
-        languages = _build_language_list(lang_totals)
-
-        repos_payload = [_format_repo(repo) for repo in owned_repos[:REPO_RESULT_LIMIT]]
-        # Contract: top_languages is [string, number][] for frontend and readme_builder
-        top_languages = [[item["name"], item["bytes"]] for item in languages[:10]]
-
-        stats = {
-            "followers": user.get("followers"),
-            "following": user.get("following"),
-            "public_repos": user.get("public_repos"),
-            "public_gists": user.get("public_gists"),
-            "total_stars": sum(repo.get("stargazers_count", 0) for repo in owned_repos),
-            "total_forks": sum(repo.get("forks_count", 0) for repo in owned_repos),
-            "total_open_issues": sum(repo.get("open_issues_count", 0) for repo in owned_repos),
-        }
-
-        return {
-            "username": user.get("login", username),
-            "name": user.get("name"),
-            "bio": user.get("bio"),
-            "followers": user.get("followers"),
-            "public_repos": user.get("public_repos"),
-            "avatar_url": user.get("avatar_url"),
-            "profile_url": user.get("html_url"),
-            "stats": stats,
-            "languages": languages,
-            "top_languages": top_languages,
-            "repos": repos_payload,
-        }
+async def _fetch_rest(
+    client: httpx.AsyncClient,
+    username: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Tuple[dict, List[RepoRecord], Dict[str, int], List[str]]:
+    deadline = time.monotonic() + PROFILE_DEADLINE if PROFILE_DEADLINE > 0 else None
+    # La primera página de repos viaja a la vez que la llamada del usuario
+    first_page = asyncio.ensure_future(_fetch_repo_page(client, username, 1)) if MAX_REPOS > 0 else None
+    try:
+        with stage("github_user"):
+            user = await asyncio.wait_for(
+                _get_json(client, f"{GITHUB_API}/users/{username}"),
+                _stage_timeout(deadline, USER_DEADLINE),
+            )
+    except BaseException as exc:
+        if first_page is not None:
+            first_page.cancel()
+            await asyncio.gather(first_page, return_exceptions=True)
+        if isinstance(exc, asyncio.TimeoutError):
+            deadline_misses.inc(stage="user")
+            raise HTTPException(status_code=504, detail=TIMEOUT_DETAIL) from exc
+        raise
+    if on_progress is not None:
+        on_progress("user", _assemble_profile(username, user, [], {}, []))
+    with stage("github_repos"):
+        repos, repos_complete = await _fetch_repos(
+            client,
+            username,
+            user.get("public_repos"),
+            first_page,
+            timeout=_stage_timeout(deadline, REPOS_DEADLINE),
+        )
+    if on_progress is not None:
+        on_progress("repos", _assemble_profile(username, user, repos, {}, []))
+
+    repos_for_languages = summarize_repos(repos).owned[:LANGUAGE_REPO_LIMIT]
+    with stage("github_languages"):
+        lang_totals, complete = await _fetch_languages(
+            client,
+            repos_for_languages,
+            timeout=_stage_timeout(deadline, LANGUAGES_DEADLINE),
+        )
+    degraded: List[str] = []
+    if not repos_complete:
+        deadline_misses.inc(stage="repos")
+        degraded.append("repos")
+    # Sin todos los repos, los lenguajes tampoco están completos
+    if not (complete and repos_complete):
+        degraded.append("languages")
+    return user, repos, lang_totals, degraded
+
+
+def _use_graphql() -> bool:
+    # La API GraphQL no admite peticiones anónimas
+    return FETCH_BACKEND == "graphql" and len(token_pool) > 0
+
+
+async def fetch_profile_data(
+    username: str,
+    client: Optional[httpx.AsyncClient] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> dict:
+    """ProfileData for ``username``.
+
+    ``on_progress`` (REST only) receives partial profiles as soon as the user
+    object and then the repo list are in, before the language calls finish.
+    """
+    if client is None:
+        async with create_client() as own_client:
+            return await fetch_profile_data(username, own_client, on_progress)
+
+    degraded: List[str] = []
+    with count_github_calls(), stage("github_profile"):
+        if _use_graphql():
+            token = token_pool.select("graphql")
+            with stage("github_graphql"):
+                # Una sola consulta: o llega entera o no hay perfil
+                graphql = fetch_profile_graphql(
+                    client,
+                    username,
+                    url=GITHUB_GRAPHQL_URL,
+                    headers=_headers(token),
+                    max_repos=MAX_REPOS,
+                    language_repo_limit=LANGUAGE_REPO_LIMIT,
+                    languages_per_repo=GRAPHQL_LANGUAGES_PER_REPO,
+                    governor=rate_limiter,
+                    budget_key=token_pool.budget_key(token, "graphql"),
+                )
+                try:
+                    user, repos, lang_totals = await asyncio.wait_for(
+                        graphql, PROFILE_DEADLINE if PROFILE_DEADLINE > 0 else None
+                    )
+                except asyncio.TimeoutError as exc:
+                    deadline_misses.inc(stage="graphql")
+                    raise HTTPException(status_code=504, detail=TIMEOUT_DETAIL) from exc
+        else:
+            user, repos, lang_totals, degraded = await _fetch_rest(client, username, on_progress)
+    return _assemble_profile(username, user, repos, lang_totals, degraded)
+
+
+def _assemble_profile(
+    username: str,
+    user: dict,
+    repos: List[RepoRecord],
+    lang_totals: Dict[str, int],
+    degraded: List[str],
+) -> dict:
+    summary = summarize_repos(repos)
+
+    languages = _build_language_list(lang_totals)
+
+    repos_payload = [_format_repo(repo) for repo in summary.owned[:REPO_RESULT_LIMIT]]
+    # Contract: top_languages is [string, number][] for frontend and readme_builder
+    top_languages = [[item["name"], item["bytes"]] for item in languages[:10]]
+
+    stats = {
+        "followers": user.get("followers"),
+        "following": user.get("following"),
+        "public_repos": user.get("public_repos"),
+        "public_gists": user.get("public_gists"),
+        "total_stars": summary.stars,
+        "total_forks": summary.forks,
+        "total_open_issues": summary.open_issues,
+    }
+
+    profile = {
+        "username": user.get("login", username),
+        "name": user.get("name"),
+        "bio": user.get("bio"),
+        "followers": user.get("followers"),
+        "public_repos": user.get("public_repos"),
+        "avatar_url": user.get("avatar_url"),
+        "profile_url": user.get("html_url"),
+        "stats": stats,
+        "languages": languages,
+        "top_languages": top_languages,
+        "repos": repos_payload,
+    }
+    if degraded:
+        # Campo extra (ProfileData permite extras): qué partes faltan por falta de presupuesto
+        profile["degraded"] = degraded
+    return profile
@@ -0,0 +1,244 @@
+"""
+GraphQL fetcher for GitHub profiles (GITHUB_FETCH_BACKEND=graphql).
+
+Returns the same (user, repos, lang_totals) triple as the REST path (a user
+dict with REST field names and RepoRecords) so github_client assembles an
+identical ProfileData payload. A profile costs ceil(MAX_REPOS / 100) round trips.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from app.jsonutil import loads
+from app.metrics import record_github_call
+from app.rate_limit import RATE_LIMIT_DETAIL, RateLimitExceeded, RateLimitGovernor
+from app.repo_record import RepoRecord
+
+PROFILE_QUERY = """
+query Profile(
+  $login: String!
+  $first: Int!
+  $after: String
+  $withUser: Boolean!
+  $withLanguages: Boolean!
+  $languagesFirst: Int!
+) {
+  user(login: $login) {
+    login
+    name @include(if: $withUser)
+    bio @include(if: $withUser)
+    avatarUrl @include(if: $withUser)
+    url @include(if: $withUser)
+    followers @include(if: $withUser) { totalCount }
+    following @include(if: $withUser) { totalCount }
+    publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) @include(if: $withUser) {
+      totalCount
+    }
+    gists(privacy: PUBLIC) @include(if: $withUser) { totalCount }
+    repositories(
+      first: $first
+      after: $after
+      privacy: PUBLIC
+      ownerAffiliations: OWNER
+      orderBy: { field: UPDATED_AT, direction: DESC }
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        description
+        stargazerCount
+        forkCount
+        isFork
+        pushedAt
+        updatedAt
+        primaryLanguage { name }
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        languages(first: $languagesFirst, orderBy: { field: SIZE, direction: DESC }) @include(if: $withLanguages) {
+          edges { size node { name } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def _total(value: Any) -> Optional[int]:
+    if isinstance(value, dict):
+        return value.get("totalCount")
+    return None
+
+
+def _user_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "login": node.get("login"),
+        "name": node.get("name"),
+        "bio": node.get("bio"),
+        "avatar_url": node.get("avatarUrl"),
+        "html_url": node.get("url"),
+        "followers": _total(node.get("followers")),
+        "following": _total(node.get("following")),
+        "public_repos": _total(node.get("publicRepos")),
+        "public_gists": _total(node.get("gists")),
+    }
+
+
+def _repo_to_rest(node: Dict[str, Any]) -> RepoRecord:
+    primary = node.get("primaryLanguage") or {}
+    # REST open_issues_count incluye issues y pull requests abiertos
+    open_issues = (_total(node.get("issues")) or 0) + (_total(node.get("pullRequests")) or 0)
+    return RepoRecord(
+        name=node.get("name"),
+        full_name=node.get("nameWithOwner"),
+        html_url=node.get("url"),
+        description=node.get("description"),
+        stargazers_count=node.get("stargazerCount", 0),
+        forks_count=node.get("forkCount", 0),
+        language=primary.get("name"),
+        pushed_at=node.get("pushedAt"),
+        updated_at=node.get("updatedAt"),
+        fork=bool(node.get("isFork")),
+        open_issues_count=open_issues,
+        languages_url=None,
+    )
+
+
+def _repo_languages(node: Dict[str, Any]) -> Dict[str, int]:
+    languages = node.get("languages") or {}
+    result: Dict[str, int] = {}
+    for edge in languages.get("edges") or []:
+        name = (edge.get("node") or {}).get("name")
+        size = edge.get("size")
+        if name and isinstance(size, int):
+            result[name] = size
+    return result
+
+
+def _raise_for_errors(response: httpx.Response, payload: Any) -> None:
+    if response.status_code >= 400:
+        detail = None
+        if isinstance(payload, dict):
+            detail = payload.get("message")
+        if response.status_code == 403 and "rate limit" in (detail or "").lower():
+            detail = RATE_LIMIT_DETAIL
+        raise HTTPException(status_code=response.status_code, detail=detail or "GitHub API error")
+
+    errors = payload.get("errors") if isinstance(payload, dict) else None
+    if not errors:
+        return
+    types = {str(error.get("type", "")).upper() for error in errors if isinstance(error, dict)}
+    if "NOT_FOUND" in types:
+        raise HTTPException(status_code=404, detail="GitHub user not found")
+    if "RATE_LIMITED" in types:
+        raise HTTPException(status_code=403, detail=RATE_LIMIT_DETAIL)
+    message = next(
+        (error.get("message") for error in errors if isinstance(error, dict) and error.get("message")),
+        None,
+    )
+    raise HTTPException(status_code=502, detail=message or "GitHub GraphQL error")
+
+
+async def _query(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    variables: Dict[str, Any],
+    governor: Optional[RateLimitGovernor],
+    budget_key: str,
+) -> Dict[str, Any]:
+    try:
+        if governor is not None:
+            await governor.acquire(budget_key)
+        response = await client.post(url, json={"query": PROFILE_QUERY, "variables": variables}, headers=headers)
+    except RateLimitExceeded as exc:
+        raise HTTPException(status_code=403, detail=RATE_LIMIT_DETAIL) from exc
+    except httpx.HTTPError as exc:
+        record_github_call("error", api="graphql")
+        raise HTTPException(
+            status_code=502,
+            detail=f"GitHub API request failed: {exc}",
+        ) from exc
+    record_github_call(response.status_code, api="graphql")
+    if governor is not None:
+        governor.observe(budget_key, response)
+    try:
+        payload = loads(response.content)
+    except ValueError:
+        payload = None
+    _raise_for_errors(response, payload)
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=502, detail="GitHub GraphQL error")
+    user = (payload.get("data") or {}).get("user")
+    if not user:
+        raise HTTPException(status_code=404, detail="GitHub user not found")
+    return user
+
+
+async def fetch_profile_graphql(
+    client: httpx.AsyncClient,
+    username: str,
+    *,
+    url: str,
+    headers: Dict[str, str],
+    max_repos: int,
+    language_repo_limit: int,
+    languages_per_repo: int,
+    governor: Optional[RateLimitGovernor] = None,
+    budget_key: str = "graphql",
+) -> Tuple[Dict[str, Any], List[RepoRecord], Dict[str, int]]:
+    user: Dict[str, Any] = {}
+    repos: List[RepoRecord] = []
+    lang_totals: Dict[str, int] = {}
+    # Lenguajes solo para los primeros repos propios (igual que la ruta REST)
+    language_budget = language_repo_limit
+    fork_languages: List[Dict[str, int]] = []
+    owned_count = 0
+    after: Optional[str] = None
+
+    while len(repos) < max_repos:
+        variables = {
+            "login": username,
+            "first": min(100, max_repos - len(repos)),
+            "after": after,
+            "withUser": not user,
+            "withLanguages": owned_count < language_budget,
+            "languagesFirst": languages_per_repo,
+        }
+        node = await _query(client, url, headers, variables, governor, budget_key)
+        if not user:
+            user = _user_to_rest(node)
+
+        connection = node.get("repositories") or {}
+        for repo_node in connection.get("nodes") or []:
+            if not isinstance(repo_node, dict) or len(repos) >= max_repos:
+                continue
+            repo = _repo_to_rest(repo_node)
+            repos.append(repo)
+            if repo.fork:
+                if len(fork_languages) < language_budget:
+                    fork_languages.append(_repo_languages(repo_node))
+                continue
+            if owned_count < language_budget:
+                for language, amount in _repo_languages(repo_node).items():
+                    lang_totals[language] = lang_totals.get(language, 0) + amount
+            owned_count += 1
+
+        page_info = connection.get("pageInfo") or {}
+        after = page_info.get("endCursor")
+        if not page_info.get("hasNextPage") or not after:
+            break
+
+    # Si todos son forks, la ruta REST usa todos los repos para los lenguajes
+    if owned_count == 0:
+        for lang_map in fork_languages:
+            for language, amount in lang_map.items():
+                lang_totals[language] = lang_totals.get(language, 0) + amount
+
+    return user, repos, lang_totals
@@ -0,0 +1,176 @@
+"""
+Byte-bounded cache for /api/proxy-image with TTL and stale-while-revalidate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+IMAGE_CACHE_TTL = float(os.getenv("IMAGE_CACHE_TTL", "1800"))
+IMAGE_CACHE_STALE_TTL = float(os.getenv("IMAGE_CACHE_STALE_TTL", "86400"))
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+IMAGE_CACHE_MAX_ITEM_BYTES = int(os.getenv("IMAGE_CACHE_MAX_ITEM_BYTES", str(2 * 1024 * 1024)))
+
+
+def normalize_image_url(url: str) -> str:
+    """Cache key: lowercase scheme/host, sorted query, no fragment."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class CachedImage:
+    __slots__ = ("content", "media_type", "etag", "stored_at")
+
+    def __init__(self, content: bytes, media_type: str, etag: Optional[str] = None) -> None:
+        self.content = content
+        self.media_type = media_type
+        self.etag = etag or '"' + hashlib.sha1(content).hexdigest()[:20] + '"'
+        self.stored_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class ImageCache:
+    def __init__(
+        self,
+        ttl: float = IMAGE_CACHE_TTL,
+        stale_ttl: float = IMAGE_CACHE_STALE_TTL,
+        max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+        max_item_bytes: int = IMAGE_CACHE_MAX_ITEM_BYTES,
+    ) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self._entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        # Descargas en curso por URL: los fallos concurrentes esperan a la primera
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def cache_control(self) -> str:
+        return f"public, max-age={int(self.ttl)}, stale-while-revalidate={int(self.stale_ttl)}"
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        """Entry if within ttl + stale_ttl; callers check ``is_fresh`` for revalidation."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.age >= self.ttl + self.stale_ttl:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if self.is_fresh(entry):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def is_fresh(self, entry: CachedImage) -> bool:
+        return entry.age < self.ttl
+
+    def put(self, key: str, content: bytes, media_type: str, etag: Optional[str] = None) -> Optional[CachedImage]:
+        """Stores ``content``; without ``etag``, an unchanged body keeps the ETag clients already hold."""
+        if self.ttl <= 0 or not content or len(content) > self.max_item_bytes:
+            return None
+        previous = self._entries.get(key)
+        if etag is None and previous is not None and previous.content == content:
+            etag = previous.etag
+        self._remove(key)
+        entry = CachedImage(content, media_type, etag)
+        self._entries[key] = entry
+        self._bytes += len(content)
+        while self._entries and self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.content)
+            self.evictions += 1
+        return entry
+
+    def new_etag(self) -> str:
+        """ETag for a streamed miss, sent before the body (and its hash) is known."""
+        return '"' + secrets.token_hex(10) + '"'
+
+    def claim(self, key: str) -> Optional[asyncio.Future]:
+        """None if the caller must download ``key`` (and later call ``release``); else the future to wait on."""
+        waiter = self._inflight.get(key)
+        if waiter is not None and not waiter.done():
+            self.coalesced += 1
+            return waiter
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        return None
+
+    def release(self, key: str, entry: Optional[CachedImage]) -> None:
+        """Ends the download of ``key``; waiters get ``entry`` (None: fetch it themselves)."""
+        waiter = self._inflight.pop(key, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(entry)
+
+    def refresh_in_background(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[tuple]]],
+    ) -> None:
+        """Revalidate a stale entry once; failures keep serving the stale copy."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def run() -> None:
+            try:
+                result = await fetch()
+                if result is None:
+                    self.refresh_failures += 1
+                    return
+                content, media_type = result
+                self.put(key, content, media_type)
+                self.refreshes += 1
+            except Exception:
+                self.refresh_failures += 1
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.ensure_future(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.content)
@@ -0,0 +1,56 @@
+"""
+JSON encoding/decoding with orjson when installed, stdlib json otherwise.
+
+Both paths produce the same compact UTF-8 output FastAPI's JSONResponse does
+(no spaces, non-ASCII kept as is). ``FastJSONResponse`` is the app's default
+response class; endpoints returning large payloads build it directly so
+FastAPI's jsonable_encoder pass is skipped too.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    # orjson no serializa subclases de tuple (RepoRecord y otros NamedTuple)
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def stdlib_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+if orjson is not None:
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError hereda de ValueError, como json.JSONDecodeError
+        return orjson.loads(data)
+
+else:
+    dumps = stdlib_dumps
+    loads = stdlib_loads
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
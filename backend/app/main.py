@@ -1,25 +1,60 @@
+import asyncio
+import base64
+import hashlib
+import os
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlparse
 
 import httpx
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import Response
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 # Carga .env desde backend/ o desde la raíz del repo
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 load_dotenv()
 
-from app.github_client import fetch_profile_data
-from app.readme_builder import build_readme
+from app.cache import ProfileCache
+from app.github_client import (
+    ProgressCallback,
+    budget_is_low,
+    create_client,
+    fetch_profile_data,
+    github_limiter,
+    language_snapshots,
+    rate_limiter,
+    response_store,
+    token_pool,
+)
+from app.image_cache import ImageCache, normalize_image_url
+from app.jsonutil import FastJSONResponse, dumps
+from app.metrics import (
+    REGISTRY,
+    http_latency,
+    http_requests,
+    proxy_bytes,
+    record_cache,
+    stage,
+    upstream_responses,
+)
+from app.prewarm import ProfilePrewarmer
+from app.preview import preview_stats, render_preview
+from app.readme_builder import PROFILE_PARTS, build_readme, render_blocks, render_cache_stats
+from app.svg_badges import badge_cache_stats, parse_shield_path, render_badge
+from app.svg_charts import render_stats_card, render_top_languages_card, svg_chart_stats
+from app.tracing import TRACING_ENABLED, export as export_trace, start_trace
 
-# Dominios permitidos para el proxy de imágenes (charts y badges)
+# Dominios permitidos para el proxy de imágenes (charts y badges);
+# IMAGE_PROXY_EXTRA_HOSTS añade otros (p. ej. el simulador de benchmarks/load_test.py)
 ALLOWED_IMAGE_HOSTS = frozenset({
     "github-readme-stats.vercel.app",
     "github-readme-stats-fast.vercel.app",
     "streak-stats.demolab.com",
     "img.shields.io",
+    *(host.strip().lower() for host in os.getenv("IMAGE_PROXY_EXTRA_HOSTS", "").split(",") if host.strip()),
 })
 
 # Dominios que generan charts (si fallan, devolvemos placeholder en vez de 502)
@@ -38,7 +73,160 @@ CHART_PLACEHOLDER_SVG = (
     + b"</text></svg>"
 )
 
-app = FastAPI()
+# Cards de github-readme-stats que dibujamos nosotros a partir del perfil (streak sigue siendo remoto)
+LOCAL_CHARTS = os.getenv("LOCAL_CHART_RENDERING", "true").lower() not in ("0", "false", "no")
+LOCAL_CHART_PATHS = {"/api": "stats", "/api/top-langs": "top_languages"}
+LOCAL_CHART_HOSTS = frozenset({
+    "github-readme-stats.vercel.app",
+    "github-readme-stats-fast.vercel.app",
+})
+
+# Badges de img.shields.io dibujados en el proceso (sin ida y vuelta por badge)
+LOCAL_BADGES = os.getenv("LOCAL_BADGE_RENDERING", "true").lower() not in ("0", "false", "no")
+BADGE_CACHE_CONTROL = "public, max-age=86400"
+
+# Markdown editado que /api/preview acepta para renderizar (caracteres)
+PREVIEW_MAX_MARKDOWN = int(os.getenv("PREVIEW_MAX_MARKDOWN", "200000"))
+
+# Bundle de imágenes del preview: URLs por petición y descargas en paralelo
+PREVIEW_ASSETS_MAX_URLS = int(os.getenv("PREVIEW_ASSETS_MAX_URLS", "50"))
+PREVIEW_ASSETS_CONCURRENCY = int(os.getenv("PREVIEW_ASSETS_CONCURRENCY", "8"))
+
+# Generación por lotes: usernames por petición y perfiles descargados en paralelo
+BATCH_MAX_USERNAMES = int(os.getenv("BATCH_MAX_USERNAMES", "500"))
+# Al menos 1: con 0 no arrancaría ningún worker y el stream esperaría para siempre
+BATCH_CONCURRENCY = max(1, int(os.getenv("BATCH_CONCURRENCY", "4")))
+
+# Timeout del cliente de imágenes; también lo que espera un fallo de caché a otro igual en curso
+IMAGE_PROXY_TIMEOUT = 20.0
+
+PROXY_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; GitHub-Readme-Generator/1.0; +https://github.com)",
+    "Accept": "image/svg+xml,image/*,*/*",
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Un único cliente para GitHub durante toda la vida del proceso (reutiliza conexiones)
+    app.state.github_client = create_client()
+    app.state.profile_cache = ProfileCache()
+    app.state.image_client = httpx.AsyncClient(
+        headers=PROXY_HEADERS,
+        follow_redirects=True,
+        timeout=IMAGE_PROXY_TIMEOUT,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    )
+    app.state.image_cache = ImageCache()
+    # Refresca en segundo plano los perfiles más pedidos antes de que caduquen
+    app.state.prewarmer = ProfilePrewarmer(
+        app.state.profile_cache,
+        lambda username: fetch_profile_data(username, app.state.github_client),
+        hourly_limit=token_pool.limit,
+        budget_is_low=budget_is_low,
+    )
+    app.state.prewarmer.start()
+    try:
+        yield
+    finally:
+        await app.state.prewarmer.stop()
+        await app.state.github_client.aclose()
+        await app.state.image_client.aclose()
+
+
+# Respuestas JSON con orjson si está instalado (ver app/jsonutil.py)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+
+class RequestMetricsMiddleware:
+    """Request count and latency per route, as plain ASGI (BaseHTTPMiddleware costs ~300 µs per request).
+
+    Latency is measured until the response headers are sent, so streaming
+    endpoints are not timed by the client reading the body.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        recorded = False
+
+        def record(status: int) -> None:
+            nonlocal recorded
+            recorded = True
+            # Plantilla de la ruta (/api/profile/{username}), no la URL: cardinalidad acotada
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_requests.inc(method=scope["method"], route=route, status=status)
+            http_latency.observe(time.perf_counter() - started, method=scope["method"], route=route)
+
+        async def send_with_metrics(message) -> None:
+            if message["type"] == "http.response.start" and not recorded:
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            if not recorded:
+                record(500)
+
+
+app.add_middleware(RequestMetricsMiddleware)
+
+
+class TracingMiddleware:
+    """Starts a trace per request, adds ``Server-Timing`` and exports the trace once the response is sent.
+
+    Only registered with TRACING_ENABLED: disabled, requests do not pass through it.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent")
+        trace = start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent.decode("latin-1") if traceparent else None,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        )
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                trace.root.set("http.status_code", message["status"])
+                # En respuestas en streaming la cabecera solo cuenta lo ocurrido hasta enviarla;
+                # la traza exportada sí cubre el cuerpo entero
+                message = dict(message)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", trace.server_timing().encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception:
+            trace.root.error = True
+            raise
+        finally:
+            trace.finish()
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                trace.root.name = f"{scope['method']} {route}"
+                trace.root.set("http.route", route)
+            await export_trace(trace)
+
+
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
 
 
 class GenerateRequest(BaseModel):
@@ -46,6 +234,22 @@ class GenerateRequest(BaseModel):
     config: dict = {}
 
 
+class PreviewRequest(BaseModel):
+    username: str = ""
+    config: dict = {}
+    # README ya generado (y quizá editado): se renderiza tal cual, sin pedir el perfil
+    markdown: str | None = None
+
+
+class PreviewAssetsRequest(BaseModel):
+    urls: list[str]
+
+
+class BatchGenerateRequest(BaseModel):
+    usernames: list[str]
+    config: dict = {}
+
+
 def _validate_username(username: str) -> str:
     cleaned = (username or "").strip()
     if not cleaned:
@@ -53,15 +257,205 @@ def _validate_username(username: str) -> str:
     return cleaned
 
 
+def _serve_stale_on(exc: BaseException) -> bool:
+    # Rate limit o GitHub caído: mejor un perfil algo viejo que un error
+    return isinstance(exc, HTTPException) and exc.status_code in (403, 429, 502, 503, 504)
+
+
+async def _get_profile(request: Request, username: str, on_progress: ProgressCallback | None = None) -> dict:
+    """Perfil desde la caché; si no está, una sola descarga compartida por usuario.
+
+    ``on_progress`` solo recibe perfiles parciales si esta petición es la que descarga.
+    """
+    state = request.app.state
+    state.prewarmer.record(username)
+    return await state.profile_cache.get_or_fetch(
+        username,
+        lambda: fetch_profile_data(username, state.github_client, on_progress),
+        prefer_stale=budget_is_low(),
+        stale_if=_serve_stale_on,
+    )
+
+
 @app.get("/api/profile/{username}")
-async def profile(username: str):
+async def profile(username: str, request: Request):
     validated = _validate_username(username)
-    return await fetch_profile_data(validated)
+    # Respuesta directa: evita el paso de jsonable_encoder sobre el perfil completo
+    return FastJSONResponse(await _get_profile(request, validated))
 
 
-@app.get("/api/proxy-image")
-async def proxy_image(url: str = Query(..., description="URL de la imagen")):
-    """Proxy para imágenes externas (charts, badges) para evitar bloqueos por origen/referrer."""
+@app.get("/api/rate-limit")
+async def rate_limit_status():
+    return {
+        **rate_limiter.snapshot(),
+        "token_pool": token_pool.snapshot(),
+        "concurrency": github_limiter.snapshot(),
+    }
+
+
+@app.get("/metrics")
+async def metrics(request: Request):
+    """Métricas en formato de texto de Prometheus."""
+    state = request.app.state
+    github = response_store.stats()
+    record_cache("profiles", state.profile_cache.stats())
+    record_cache("github_responses", {
+        "hits": github["fresh_hits"] + github["revalidated"],
+        "misses": github["stored"],
+        "entries": github["entries"],
+    })
+    record_cache("language_snapshots", language_snapshots.stats())
+    record_cache("images", state.image_cache.stats())
+    record_cache("render_fragments", {
+        "hits": render_cache_stats["fragment_hits"],
+        "misses": render_cache_stats["fragment_misses"],
+    })
+    record_cache("preview", preview_stats())
+    record_cache("svg_charts", svg_chart_stats())
+    record_cache("badges", badge_cache_stats())
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/cache/stats")
+async def cache_stats(request: Request):
+    return {
+        "profiles": request.app.state.profile_cache.stats(),
+        "github_responses": response_store.stats(),
+        "language_snapshots": language_snapshots.stats(),
+        "images": request.app.state.image_cache.stats(),
+        "render": dict(render_cache_stats),
+        "preview": preview_stats(),
+        "svg_charts": svg_chart_stats(),
+        "badges": badge_cache_stats(),
+        "prewarm": request.app.state.prewarmer.stats(),
+    }
+
+
+def _placeholder_response() -> Response:
+    # El placeholder no se cachea: la próxima petición vuelve a intentar el chart real
+    return Response(
+        content=CHART_PLACEHOLDER_SVG,
+        media_type="image/svg+xml",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+def _cached_image_response(request: Request, entry, cache: ImageCache) -> Response:
+    headers = {"Cache-Control": cache.cache_control(), "ETag": entry.etag}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    proxy_bytes.inc(len(entry.content), source="cache")
+    return Response(content=entry.content, media_type=entry.media_type, headers=headers)
+
+
+async def _wait_for_download(cache: ImageCache, key: str, waiter: asyncio.Future):
+    """Entry stored by the in-flight download of ``key``; None if it failed or was not cacheable."""
+    try:
+        return await asyncio.wait_for(asyncio.shield(waiter), IMAGE_PROXY_TIMEOUT)
+    except asyncio.TimeoutError:
+        # La descarga original no terminó nunca: se libera para que no bloquee a las siguientes
+        cache.release(key, None)
+        return None
+
+
+async def _fetch_image(client: httpx.AsyncClient, url: str):
+    """Descarga completa (para revalidar en segundo plano). None si falla."""
+    host = httpx.URL(url).host
+    try:
+        with stage("proxy_fetch"):
+            resp = await client.get(url)
+    except httpx.HTTPError:
+        upstream_responses.inc(host=host, status="error")
+        return None
+    upstream_responses.inc(host=host, status=resp.status_code)
+    if resp.status_code != 200:
+        return None
+    return resp.content, resp.headers.get("content-type", "image/png")
+
+
+def _param_bool(value, default: bool) -> bool:
+    if value is None:
+        return default
+    return str(value).strip().lower() not in ("0", "false", "no", "")
+
+
+def _param_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _svg_response(request: Request, svg: str, cache_control: str) -> Response:
+    content = svg.encode("utf-8")
+    etag = '"' + hashlib.sha1(content).hexdigest()[:20] + '"'
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    proxy_bytes.inc(len(content), source="local")
+    return Response(content=content, media_type="image/svg+xml", headers=headers)
+
+
+async def _render_chart(request: Request, chart: str, params: dict) -> tuple[str, bool]:
+    """Card SVG dibujada localmente con los mismos parámetros que github-readme-stats.
+
+    Devuelve también si el perfil estaba incompleto ("degraded").
+    """
+    profile_data = await _get_profile(request, _validate_username(params.get("username") or ""))
+    degraded = bool(profile_data.get("degraded"))
+    theme = params.get("theme")
+    hide_border = _param_bool(params.get("hide_border"), False)
+    with stage("render_chart"):
+        if chart == "stats":
+            svg = render_stats_card(
+                profile_data,
+                theme=theme,
+                hide_border=hide_border,
+                show_icons=_param_bool(params.get("show_icons"), False),
+            )
+        else:
+            svg = render_top_languages_card(
+                profile_data,
+                layout=params.get("layout"),
+                langs_count=_param_int(params.get("langs_count"), 5),
+                theme=theme,
+                hide_border=hide_border,
+            )
+    return svg, degraded
+
+
+def _chart_cache_control(request: Request, degraded: bool) -> str:
+    cache: ProfileCache = request.app.state.profile_cache
+    # Con datos incompletos, navegadores y CDN solo la guardan lo que la caché guarda el perfil
+    ttl = cache.partial_ttl if degraded else cache.ttl
+    return f"public, max-age={int(ttl)}"
+
+
+async def _chart_response(request: Request, chart: str, params: dict) -> Response:
+    _validate_username(params.get("username") or "")
+    try:
+        svg, degraded = await _render_chart(request, chart, params)
+    except HTTPException:
+        return _placeholder_response()
+    return _svg_response(request, svg, _chart_cache_control(request, degraded))
+
+
+def _local_target(host: str, parsed) -> str | None:
+    """"stats"/"top_languages"/"badge" si la URL se dibuja en el proceso; None si hay que pedirla."""
+    path = parsed.path.rstrip("/")
+    if LOCAL_CHARTS and host in LOCAL_CHART_HOSTS and path in LOCAL_CHART_PATHS:
+        return LOCAL_CHART_PATHS[path]
+    if LOCAL_BADGES and host == "img.shields.io" and parse_shield_path(parsed.path) is not None:
+        return "badge"
+    return None
+
+
+def _render_badge_url(parsed) -> str:
+    query = dict(parse_qsl(parsed.query))
+    return render_badge(*parse_shield_path(parsed.path), query.get("style", "flat"), query.get("logo"))
+
+
+def _parse_image_url(url: str):
     try:
         parsed = urlparse(url)
     except Exception:
@@ -70,35 +464,324 @@ async def proxy_image(url: str = Query(..., description="URL de la imagen")):
         raise HTTPException(status_code=400, detail="URL inválida")
     if parsed.netloc.lower() not in ALLOWED_IMAGE_HOSTS:
         raise HTTPException(status_code=403, detail="Dominio no permitido para proxy")
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; GitHub-Readme-Generator/1.0; +https://github.com)",
-        "Accept": "image/svg+xml,image/*,*/*",
-    }
+    return parsed
+
+
+@app.get("/api/charts/stats.svg")
+async def stats_chart(request: Request):
+    return await _chart_response(request, "stats", dict(request.query_params))
+
+
+@app.get("/api/charts/top-langs.svg")
+async def top_languages_chart(request: Request):
+    return await _chart_response(request, "top_languages", dict(request.query_params))
+
+
+@app.get("/api/badge")
+async def badge(
+    request: Request,
+    message: str = Query(..., description="Texto de la derecha"),
+    label: str = Query("", description="Texto de la izquierda"),
+    color: str = Query("lightgrey"),
+    style: str = Query("flat"),
+    logo: str = Query(""),
+):
+    """Badge SVG estilo shields.io dibujado localmente."""
+    return _svg_response(request, render_badge(label, message, color, style, logo or None), BADGE_CACHE_CONTROL)
+
+
+@app.get("/api/proxy-image")
+async def proxy_image(request: Request, url: str = Query(..., description="URL de la imagen")):
+    """Proxy para imágenes externas (charts, badges) para evitar bloqueos por origen/referrer."""
+    parsed = _parse_image_url(url)
     host = parsed.netloc.lower()
-    async with httpx.AsyncClient(follow_redirects=True, timeout=20.0) as client:
-        try:
-            resp = await client.get(url, headers=headers)
-        except httpx.HTTPError as e:
-            if host in CHART_HOSTS:
-                return Response(
-                    content=CHART_PLACEHOLDER_SVG,
-                    media_type="image/svg+xml",
-                )
-            raise HTTPException(status_code=502, detail="Error al obtener imagen") from e
+    target = _local_target(host, parsed)
+    if target == "badge":
+        return _svg_response(request, _render_badge_url(parsed), BADGE_CACHE_CONTROL)
+    if target is not None:
+        return await _chart_response(request, target, dict(parse_qsl(parsed.query)))
+    client: httpx.AsyncClient = request.app.state.image_client
+    cache: ImageCache = request.app.state.image_cache
+    key = normalize_image_url(url)
+
+    cached = cache.get(key)
+    if cached is not None:
+        if not cache.is_fresh(cached):
+            # stale-while-revalidate: respondemos ya y refrescamos en segundo plano
+            cache.refresh_in_background(key, lambda: _fetch_image(client, url))
+        return _cached_image_response(request, cached, cache)
+
+    # Single-flight: si la misma URL ya se está descargando, se espera a esa copia
+    waiter = cache.claim(key)
+    if waiter is not None:
+        entry = await _wait_for_download(cache, key, waiter)
+        if entry is not None:
+            return _cached_image_response(request, entry, cache)
+    leader = waiter is None
+
+    try:
+        with stage("proxy_fetch"):
+            resp = await client.send(client.build_request("GET", url), stream=True)
+    except httpx.HTTPError as e:
+        if leader:
+            cache.release(key, None)
+        upstream_responses.inc(host=host, status="error")
+        if host in CHART_HOSTS:
+            return _placeholder_response()
+        raise HTTPException(status_code=502, detail="Error al obtener imagen") from e
+    upstream_responses.inc(host=host, status=resp.status_code)
     if resp.status_code != 200:
+        if leader:
+            cache.release(key, None)
+        await resp.aclose()
         if host in CHART_HOSTS:
-            return Response(
-                content=CHART_PLACEHOLDER_SVG,
-                media_type="image/svg+xml",
-            )
+            return _placeholder_response()
         raise HTTPException(status_code=502, detail="La imagen externa no está disponible")
     media_type = resp.headers.get("content-type", "image/png")
-    return Response(content=resp.content, media_type=media_type)
+    # El hash del cuerpo no se conoce antes de enviarlo: se usa el ETag de origen (o uno nuevo)
+    # y la copia guardada lleva el mismo, así la primera revalidación ya puede ser 304
+    etag = resp.headers.get("etag") or cache.new_etag()
+
+    async def body():
+        # Se reenvía cada fragmento al navegador y se guarda una copia si cabe en la caché
+        chunks = []
+        size = 0
+        complete = False
+        entry = None
+        try:
+            async for chunk in resp.aiter_bytes():
+                size += len(chunk)
+                if size <= cache.max_item_bytes:
+                    chunks.append(chunk)
+                yield chunk
+            complete = True
+        finally:
+            await resp.aclose()
+            proxy_bytes.inc(size, source="upstream")
+            if complete and size <= cache.max_item_bytes:
+                entry = cache.put(key, b"".join(chunks), media_type, etag)
+            if leader:
+                cache.release(key, entry)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Cache-Control": cache.cache_control(), "ETag": etag},
+    )
+
+
+def _data_uri(content: bytes, media_type: str, source: str) -> str:
+    proxy_bytes.inc(len(content), source=source)
+    return f"data:{media_type};base64,{base64.b64encode(content).decode('ascii')}"
+
+
+async def _asset_data_uri(request: Request, url: str) -> str:
+    """Misma resolución que /api/proxy-image (local, caché, descarga), como data URI."""
+    parsed = _parse_image_url(url)
+    host = parsed.netloc.lower()
+    target = _local_target(host, parsed)
+    if target == "badge":
+        return _data_uri(_render_badge_url(parsed).encode("utf-8"), "image/svg+xml", "local")
+    if target is not None:
+        try:
+            svg, _ = await _render_chart(request, target, dict(parse_qsl(parsed.query)))
+        except HTTPException:
+            return _data_uri(CHART_PLACEHOLDER_SVG, "image/svg+xml", "local")
+        return _data_uri(svg.encode("utf-8"), "image/svg+xml", "local")
+
+    client: httpx.AsyncClient = request.app.state.image_client
+    cache: ImageCache = request.app.state.image_cache
+    key = normalize_image_url(url)
+    cached = cache.get(key)
+    if cached is not None:
+        if not cache.is_fresh(cached):
+            cache.refresh_in_background(key, lambda: _fetch_image(client, url))
+        return _data_uri(cached.content, cached.media_type, "cache")
+
+    waiter = cache.claim(key)
+    if waiter is not None:
+        entry = await _wait_for_download(cache, key, waiter)
+        if entry is not None:
+            return _data_uri(entry.content, entry.media_type, "cache")
+        fetched = await _fetch_image(client, url)
+    else:
+        entry = None
+        try:
+            fetched = await _fetch_image(client, url)
+            if fetched is not None:
+                entry = cache.put(key, *fetched)
+        finally:
+            cache.release(key, entry)
+    if fetched is None:
+        if host in CHART_HOSTS:
+            return _data_uri(CHART_PLACEHOLDER_SVG, "image/svg+xml", "local")
+        raise HTTPException(status_code=502, detail="La imagen externa no está disponible")
+    content, media_type = fetched
+    if waiter is not None:
+        cache.put(key, content, media_type)
+    return _data_uri(content, media_type, "upstream")
+
+
+@app.post("/api/preview-assets")
+async def preview_assets(req: PreviewAssetsRequest, request: Request):
+    """Todas las imágenes de un preview en una respuesta: ``{url: data URI}`` + errores por URL."""
+    urls = list(dict.fromkeys(url.strip() for url in req.urls if url and url.strip()))
+    if len(urls) > PREVIEW_ASSETS_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"Too many urls (max {PREVIEW_ASSETS_MAX_URLS})")
+    semaphore = asyncio.Semaphore(PREVIEW_ASSETS_CONCURRENCY)
+    assets: dict[str, str] = {}
+    errors: dict[str, dict] = {}
+
+    async def load(url: str) -> None:
+        async with semaphore:
+            try:
+                assets[url] = await _asset_data_uri(request, url)
+            except HTTPException as exc:
+                errors[url] = {"status": exc.status_code, "detail": exc.detail}
+
+    await asyncio.gather(*(load(url) for url in urls))
+    return {"assets": {url: assets[url] for url in urls if url in assets}, "errors": errors}
 
 
 @app.post("/api/generate")
-async def generate(req: GenerateRequest):
+async def generate(req: GenerateRequest, request: Request):
     validated = _validate_username(req.username)
-    profile_data = await fetch_profile_data(validated)
+    profile_data = await _get_profile(request, validated)
+    return FastJSONResponse(build_readme(profile_data, req.config))
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+def _with_html(data: dict) -> dict:
+    # El frontend pinta el preview con este HTML saneado, sin parsear markdown
+    return {**data, "html": _preview_html(data["markdown"])}
+
+
+@app.post("/api/generate/stream")
+async def generate_stream(req: GenerateRequest, request: Request):
+    """Como /api/generate, pero en Server-Sent Events: cada sección sale en cuanto llegan sus datos.
+
+    Eventos: ``section`` (bloque de render_blocks) y al final ``done`` (lo mismo
+    que /api/generate), ambos con su ``html`` como /api/preview, o ``error``. Si
+    falla antes del primer evento (p. ej. 404) se responde con el error HTTP normal.
+    """
+    validated = _validate_username(req.username)
+    progress: asyncio.Queue = asyncio.Queue()
+    profile_task = asyncio.ensure_future(
+        _get_profile(request, validated, lambda part, partial: progress.put_nowait((part, partial)))
+    )
+    # None marca el final: perfil completo o error
+    profile_task.add_done_callback(lambda _: progress.put_nowait(None))
+
+    first = await progress.get()
+    if first is None:
+        profile_task.result()
+
+    async def events():
+        item = first
+        pending = set(PROFILE_PARTS)
+        try:
+            while item is not None:
+                part, partial = item
+                pending.discard(part)
+                for block in render_blocks(partial, req.config, (part,)):
+                    yield _sse("section", _with_html(block))
+                item = await progress.get()
+            try:
+                profile_data = profile_task.result()
+            except HTTPException as exc:
+                yield _sse("error", {"status": exc.status_code, "detail": exc.detail})
+                return
+            except Exception as exc:
+                yield _sse("error", {"status": 500, "detail": str(exc) or "Internal error"})
+                return
+            # Lo que no llegó por partes (caché, descarga compartida, GraphQL) sale ahora
+            for block in render_blocks(profile_data, req.config, pending):
+                yield _sse("section", _with_html(block))
+            yield _sse("done", _with_html(build_readme(profile_data, req.config)))
+        finally:
+            if not profile_task.done():
+                profile_task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _preview_html(markdown: str) -> str:
+    with stage("render_preview"):
+        return render_preview(markdown, ALLOWED_IMAGE_HOSTS)
+
+
+@app.post("/api/preview")
+async def preview(req: PreviewRequest, request: Request):
+    """README renderizado a HTML en el servidor (imágenes ya apuntando al proxy).
+
+    Con ``markdown`` se renderiza ese texto (el README editado en el frontend)
+    en lugar de generar el del usuario.
+    """
+    if req.markdown is not None:
+        if len(req.markdown) > PREVIEW_MAX_MARKDOWN:
+            raise HTTPException(status_code=413, detail=f"Markdown too large (max {PREVIEW_MAX_MARKDOWN} characters)")
+        return FastJSONResponse({"markdown": req.markdown, "html": _preview_html(req.markdown)})
+    validated = _validate_username(req.username)
+    profile_data = await _get_profile(request, validated)
     result = build_readme(profile_data, req.config)
-    return result
+    return FastJSONResponse({**result, "html": _preview_html(result["markdown"])})
+
+
+def _batch_usernames(usernames: list[str]) -> list[str]:
+    unique: list[str] = []
+    seen = set()
+    for username in usernames:
+        cleaned = (username or "").strip()
+        if cleaned and cleaned.lower() not in seen:
+            seen.add(cleaned.lower())
+            unique.append(cleaned)
+    if not unique:
+        raise HTTPException(status_code=400, detail="usernames is required and cannot be empty")
+    if len(unique) > BATCH_MAX_USERNAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many usernames (max {BATCH_MAX_USERNAMES})",
+        )
+    return unique
+
+
+@app.post("/api/generate/batch")
+async def generate_batch(req: BatchGenerateRequest, request: Request):
+    """Genera varios READMEs con la misma config; responde NDJSON a medida que terminan."""
+    usernames = _batch_usernames(req.usernames)
+
+    async def generate_one(username: str) -> dict:
+        try:
+            profile_data = await _get_profile(request, username)
+            return {"username": username, **build_readme(profile_data, req.config)}
+        except HTTPException as exc:
+            return {"username": username, "error": {"status": exc.status_code, "detail": exc.detail}}
+        except Exception as exc:
+            return {"username": username, "error": {"status": 500, "detail": str(exc) or "Internal error"}}
+
+    async def lines():
+        pending = iter(usernames)
+        # Cola acotada: si el cliente lee despacio, los workers esperan en vez de acumular resultados
+        results: asyncio.Queue = asyncio.Queue(maxsize=BATCH_CONCURRENCY)
+
+        async def worker() -> None:
+            for username in pending:
+                await results.put(await generate_one(username))
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(BATCH_CONCURRENCY, len(usernames)))]
+        try:
+            for _ in range(len(usernames)):
+                item = await results.get()
+                yield dumps(item) + b"\n"
+        finally:
+            for task in workers:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,240 @@
+"""
+Minimal Prometheus metrics (text exposition format 0.0.4) without extra dependencies.
+
+Counters, gauges and histograms keyed by label values, plus ``stage(name)``,
+a timer that feeds the per-stage latency histogram and opens a tracing span.
+Instrumented code only does a dict lookup and a few additions per observation.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.tracing import span
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CALL_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        self._values[self._key(labels)] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Por etiqueta: [conteo por bucket (no acumulado) + desbordamiento, suma, total]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+            self._series[key] = series
+        counts, totals = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        for key, (counts, totals) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(totals[0])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(totals[1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.counter(
+    "readme_http_requests_total", "HTTP requests handled, by route and status.", ("method", "route", "status")
+)
+http_latency = REGISTRY.histogram(
+    "readme_http_request_duration_seconds", "Time until the response headers are sent.", ("method", "route")
+)
+stage_latency = REGISTRY.histogram(
+    "readme_stage_duration_seconds", "Latency of internal stages (GitHub fetches, rendering, proxy).", ("stage",)
+)
+github_requests = REGISTRY.counter(
+    "readme_github_requests_total", "Requests sent to the GitHub API, by response status.", ("api", "status")
+)
+github_calls_per_profile = REGISTRY.histogram(
+    "readme_github_calls_per_profile", "GitHub API requests needed to fetch one profile.", buckets=CALL_BUCKETS
+)
+deadline_misses = REGISTRY.counter(
+    "readme_github_deadline_misses_total", "Profile fetch stages cut short by their deadline.", ("stage",)
+)
+upstream_responses = REGISTRY.counter(
+    "readme_proxy_upstream_responses_total", "Image proxy upstream responses, by host and status.", ("host", "status")
+)
+proxy_bytes = REGISTRY.counter(
+    "readme_proxy_bytes_total", "Image bytes served, by source (local, cache, upstream).", ("source",)
+)
+cache_hit_ratio = REGISTRY.gauge("readme_cache_hit_ratio", "Hit ratio of each in-process cache.", ("cache",))
+cache_entries = REGISTRY.gauge("readme_cache_entries", "Entries held by each in-process cache.", ("cache",))
+
+# Contadores activos de llamadas a GitHub (anidables: perfil dentro de una ronda de prewarm)
+_call_counters: ContextVar[Tuple[List[int], ...]] = ContextVar("github_call_counters", default=())
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """``with stage("github_repos"): ...`` records the block's duration (also on error).
+
+    The block is also a tracing span when the request is being traced.
+    """
+    started = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        stage_latency.observe(time.perf_counter() - started, stage=name)
+
+
+@contextmanager
+def count_github_calls(observe: bool = True) -> Iterator[List[int]]:
+    """Counts the GitHub requests made inside the block, including spawned tasks.
+
+    Yields ``[requests, billable]`` (304 responses do not spend rate-limit
+    budget). With ``observe`` the block counts as one profile fetch.
+    """
+    calls = [0, 0]
+    token = _call_counters.set(_call_counters.get() + (calls,))
+    try:
+        yield calls
+    finally:
+        _call_counters.reset(token)
+        if observe:
+            github_calls_per_profile.observe(calls[0])
+
+
+def record_github_call(status: object, api: str = "rest") -> None:
+    github_requests.inc(api=api, status=status)
+    billable = isinstance(status, int) and status != 304
+    for calls in _call_counters.get():
+        calls[0] += 1
+        calls[1] += billable
+
+
+def record_cache(name: str, stats: Dict[str, object]) -> None:
+    """Copies hits/misses/entries from a cache's stats() dict into the gauges."""
+    hits = float(stats.get("hits") or 0)  # type: ignore[arg-type]
+    misses = float(stats.get("misses") or 0)  # type: ignore[arg-type]
+    if hits + misses:
+        cache_hit_ratio.set(hits / (hits + misses), cache=name)
+    if "entries" in stats:
+        cache_entries.set(float(stats["entries"] or 0), cache=name)  # type: ignore[arg-type]
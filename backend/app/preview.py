@@ -0,0 +1,173 @@
+"""
+Server-side preview: README markdown (as produced by build_readme) to sanitized HTML.
+
+Only the subset build_readme emits is supported: ``#``/``##`` headings, ``-``
+lists, paragraphs, images, linked images, links and the repos ``<table>``.
+Everything else is escaped. Image URLs are rewritten to /api/proxy-image in the
+same pass; images on hosts outside the allow-list are replaced by their alt text.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote, urlparse
+
+from app.readme_builder import _html_escape
+
+PREVIEW_CACHE_SIZE = int(os.getenv("PREVIEW_CACHE_SIZE", "256"))
+PROXY_PATH = "/api/proxy-image"
+
+_INLINE = re.compile(
+    r"\[!\[(?P<lalt>[^\]]*)\]\((?P<lsrc>[^)\s]+)\)\]\((?P<lhref>[^)\s]+)\)"
+    r"|!\[(?P<alt>[^\]]*)\]\((?P<src>[^)\s]+)\)"
+    r"|\[(?P<text>[^\]]+)\]\((?P<href>[^)\s]+)\)"
+)
+
+_TABLE_TAGS = frozenset({"table", "thead", "tbody", "tr", "th", "td", "a"})
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+preview_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _safe_href(url: str) -> Optional[str]:
+    scheme = urlparse(url).scheme.lower()
+    if scheme in ("http", "https", "mailto"):
+        return url
+    return None
+
+
+def _image_src(url: str, allowed_hosts: Iterable[str]) -> Optional[str]:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or parsed.netloc.lower() not in allowed_hosts:
+        return None
+    return f"{PROXY_PATH}?url={quote(url, safe='')}"
+
+
+def _render_image(alt: str, src: str, allowed_hosts: Iterable[str]) -> str:
+    proxied = _image_src(src, allowed_hosts)
+    if proxied is None:
+        return _html_escape(alt)
+    return f'<img src="{_html_escape(proxied)}" alt="{_html_escape(alt)}" loading="lazy">'
+
+
+def _render_link(inner_html: str, href: str) -> str:
+    safe = _safe_href(href)
+    if safe is None:
+        return inner_html
+    return f'<a href="{_html_escape(safe)}" rel="noopener noreferrer">{inner_html}</a>'
+
+
+def _render_inline(text: str, allowed_hosts: Iterable[str]) -> str:
+    parts: List[str] = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        parts.append(_html_escape(text[position:match.start()]))
+        if match.group("lsrc") is not None:
+            image = _render_image(match.group("lalt"), match.group("lsrc"), allowed_hosts)
+            parts.append(_render_link(image, match.group("lhref")))
+        elif match.group("src") is not None:
+            parts.append(_render_image(match.group("alt"), match.group("src"), allowed_hosts))
+        else:
+            parts.append(_render_link(_html_escape(match.group("text")), match.group("href")))
+        position = match.end()
+    parts.append(_html_escape(text[position:]))
+    return "".join(parts)
+
+
+class _TableSanitizer(HTMLParser):
+    """Re-emits only allow-listed table tags; text is escaped, attributes dropped except a[href]."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.out: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Any]) -> None:
+        if tag not in _TABLE_TAGS:
+            return
+        if tag == "a":
+            href = _safe_href(dict(attrs).get("href") or "")
+            if href is None:
+                self.out.append("<a>")
+            else:
+                self.out.append(f'<a href="{_html_escape(href)}" rel="noopener noreferrer">')
+            return
+        self.out.append(f"<{tag}>")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _TABLE_TAGS:
+            self.out.append(f"</{tag}>")
+
+    def handle_data(self, data: str) -> None:
+        self.out.append(_html_escape(data))
+
+
+def _sanitize_table(raw: str) -> str:
+    sanitizer = _TableSanitizer()
+    sanitizer.feed(raw)
+    sanitizer.close()
+    return "".join(sanitizer.out)
+
+
+def markdown_to_html(markdown: str, allowed_hosts: Iterable[str]) -> str:
+    html: List[str] = []
+    paragraph: List[str] = []
+    items: List[str] = []
+
+    def flush() -> None:
+        if paragraph:
+            html.append(f"<p>{chr(10).join(paragraph)}</p>")
+            paragraph.clear()
+        if items:
+            html.append("<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>")
+            items.clear()
+
+    for raw_line in markdown.splitlines():
+        line = raw_line.strip()
+        if not line:
+            flush()
+        elif line.startswith("<table"):
+            flush()
+            html.append(_sanitize_table(line))
+        elif line.startswith("## "):
+            flush()
+            html.append(f"<h2>{_render_inline(line[3:].strip(), allowed_hosts)}</h2>")
+        elif line.startswith("# "):
+            flush()
+            html.append(f"<h1>{_render_inline(line[2:].strip(), allowed_hosts)}</h1>")
+        elif line.startswith("- "):
+            if paragraph:
+                html.append(f"<p>{chr(10).join(paragraph)}</p>")
+                paragraph.clear()
+            items.append(_render_inline(line[2:].strip(), allowed_hosts))
+        else:
+            if items:
+                flush()
+            paragraph.append(_render_inline(line, allowed_hosts))
+    flush()
+    return "\n".join(html)
+
+
+def render_preview(markdown: str, allowed_hosts: Iterable[str]) -> str:
+    """Sanitized HTML for ``markdown``, cached by markdown hash."""
+    key = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        preview_cache_stats["hits"] += 1
+        return cached
+    preview_cache_stats["misses"] += 1
+    html = markdown_to_html(markdown, allowed_hosts)
+    if PREVIEW_CACHE_SIZE > 0:
+        _cache[key] = html
+        while len(_cache) > PREVIEW_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return html
+
+
+def preview_stats() -> Dict[str, Any]:
+    return {"entries": len(_cache), "max_entries": PREVIEW_CACHE_SIZE, **preview_cache_stats}
@@ -0,0 +1,203 @@
+"""
+Background pre-warming of popular profiles.
+
+Every profile request bumps a per-username score that decays with a half-life,
+so the ranking follows current traffic. A background task wakes up every
+PREWARM_INTERVAL seconds and refreshes the hottest cached profiles that are
+about to expire (or already expired), before a user has to wait for the
+GitHub fan-out. Users without a cached profile (never fetched, 404, evicted)
+are left to the next request, and a failed refresh drops the user's score.
+Refreshes go through the usual conditional requests, so unchanged data costs
+304s, which GitHub does not bill.
+
+Spending is capped at PREWARM_BUDGET_SHARE of the hourly rate limit, and
+refreshing stops while the budget is low.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.cache import ProfileCache, normalize_username
+from app.metrics import count_github_calls, stage
+
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "true").lower() not in ("0", "false", "no")
+PREWARM_INTERVAL = float(os.getenv("PREWARM_INTERVAL", "15"))
+# Se refresca cuando al perfil le quedan menos de estos segundos de TTL
+PREWARM_WINDOW = float(os.getenv("PREWARM_WINDOW", "60"))
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "50"))
+# Puntuación mínima (≈ peticiones recientes) para considerarse popular
+PREWARM_MIN_SCORE = float(os.getenv("PREWARM_MIN_SCORE", "3"))
+PREWARM_HALF_LIFE = float(os.getenv("PREWARM_HALF_LIFE", "1800"))
+# Fracción del límite horario de GitHub que puede gastar el prewarm
+PREWARM_BUDGET_SHARE = float(os.getenv("PREWARM_BUDGET_SHARE", "0.2"))
+PREWARM_MAX_TRACKED = int(os.getenv("PREWARM_MAX_TRACKED", "10000"))
+
+# Sin datos de GitHub todavía: se asume el límite anónimo
+DEFAULT_HOURLY_LIMIT = 60
+BUDGET_WINDOW = 3600.0
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilePrewarmer:
+    def __init__(
+        self,
+        cache: ProfileCache,
+        fetch: Callable[[str], Awaitable[Any]],
+        *,
+        hourly_limit: Callable[[], Optional[int]],
+        budget_is_low: Callable[[], bool],
+        interval: float = PREWARM_INTERVAL,
+        window: float = PREWARM_WINDOW,
+        top_n: int = PREWARM_TOP_N,
+        min_score: float = PREWARM_MIN_SCORE,
+        half_life: float = PREWARM_HALF_LIFE,
+        budget_share: float = PREWARM_BUDGET_SHARE,
+        max_tracked: int = PREWARM_MAX_TRACKED,
+    ) -> None:
+        self.cache = cache
+        self.fetch = fetch
+        self.hourly_limit = hourly_limit
+        self.budget_is_low = budget_is_low
+        self.interval = interval
+        # La ventana nunca puede ser mayor que medio TTL (si no, se refrescaría sin parar)
+        self.window = min(window, cache.ttl / 2) if cache.ttl > 0 else window
+        self.top_n = top_n
+        self.min_score = min_score
+        self.half_life = half_life
+        self.budget_share = budget_share
+        self.max_tracked = max_tracked
+        # username -> (puntuación, instante de la última actualización)
+        self._scores: Dict[str, Tuple[float, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._window_started = time.monotonic()
+        self.spent = 0
+        self.rounds = 0
+        self.refreshed = 0
+        self.failures = 0
+        self.skipped_budget = 0
+
+    @property
+    def enabled(self) -> bool:
+        return PREWARM_ENABLED and self.cache.enabled and self.budget_share > 0 and self.top_n > 0
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        if self.half_life <= 0:
+            return score
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def record(self, username: str) -> None:
+        key = normalize_username(username)
+        now = time.monotonic()
+        score, updated = self._scores.get(key, (0.0, now))
+        self._scores[key] = (self._decayed(score, updated, now) + 1.0, now)
+        if len(self._scores) > self.max_tracked:
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        ranked = sorted(
+            self._scores.items(),
+            key=lambda item: self._decayed(item[1][0], item[1][1], now),
+            reverse=True,
+        )
+        self._scores = dict(ranked[: int(self.max_tracked * 0.9)])
+
+    def hottest(self) -> List[Tuple[str, float]]:
+        now = time.monotonic()
+        scored = [
+            (key, self._decayed(score, updated, now))
+            for key, (score, updated) in self._scores.items()
+        ]
+        scored = [item for item in scored if item[1] >= self.min_score]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[: self.top_n]
+
+    def _allowance(self) -> int:
+        now = time.monotonic()
+        if now - self._window_started >= BUDGET_WINDOW:
+            self._window_started = now
+            self.spent = 0
+        limit = self.hourly_limit() or DEFAULT_HOURLY_LIMIT
+        return int(limit * self.budget_share) - self.spent
+
+    def due(self) -> List[str]:
+        """Hot usernames whose cached profile expires within the window (or already expired)."""
+        due: List[str] = []
+        for key, _ in self.hottest():
+            expires_in = self.cache.expires_in(key)
+            # Sin entrada en caché (404, expulsada) no se refresca: la traerá la próxima petición
+            if expires_in is not None and expires_in <= self.window:
+                due.append(key)
+        return due
+
+    async def run_once(self) -> int:
+        """One round: refresh due profiles, hottest first, while budget allows. Returns refreshes."""
+        self.rounds += 1
+        refreshed = 0
+        for key in self.due():
+            if self.budget_is_low() or self._allowance() <= 0:
+                self.skipped_budget += 1
+                break
+            try:
+                with count_github_calls(observe=False) as calls, stage("prewarm_refresh"):
+                    await self.cache.refresh(key, lambda key=key: self.fetch(key))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.failures += 1
+                # Deja de ser popular hasta que vuelvan a pedirlo: no se reintenta cada ronda
+                self._scores.pop(key, None)
+                logger.debug("prewarm of %s failed: %s", key, exc)
+            else:
+                refreshed += 1
+            finally:
+                self.spent += calls[1]
+        self.refreshed += refreshed
+        return refreshed
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failures += 1
+                logger.exception("prewarm round failed")
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        limit = self.hourly_limit() or DEFAULT_HOURLY_LIMIT
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None,
+            "interval": self.interval,
+            "window": self.window,
+            "tracked": len(self._scores),
+            "hot": len(self.hottest()),
+            "rounds": self.rounds,
+            "refreshed": self.refreshed,
+            "failures": self.failures,
+            "skipped_budget": self.skipped_budget,
+            "budget": int(limit * self.budget_share),
+            "spent": self.spent,
+        }
@@ -0,0 +1,219 @@
+"""
+Adaptive rate-limit governor for GitHub requests.
+
+Reads X-RateLimit-* and Retry-After from every response, keeps a budget per
+key (token + API resource) and paces outgoing requests when the remaining
+budget gets low, so it lasts until the reset instead of failing mid-profile.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Por debajo de este "remaining" se reparten las peticiones hasta el reset
+# (como mucho PACING_FRACTION del límite: con 60/h no se reparte desde la primera)
+PACING_THRESHOLD = int(os.getenv("GITHUB_RATE_LIMIT_PACING_THRESHOLD", "500"))
+PACING_FRACTION = 0.1
+# Por debajo de este "remaining" se omiten llamadas opcionales (languages_url) y se sirve caché vieja
+LOW_WATERMARK = int(os.getenv("GITHUB_RATE_LIMIT_LOW_WATERMARK", "100"))
+# Espera máxima por petición: el reparto nunca espera más; solo se responde 403 sin presupuesto
+MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "5"))
+
+RATE_LIMIT_DETAIL = (
+    "Límite de la API de GitHub alcanzado. "
+    "Configura GITHUB_TOKEN en tu .env (token de GitHub con permisos de lectura) y reinicia el backend para aumentar el límite."
+)
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, key: str, retry_in: float) -> None:
+        super().__init__(f"GitHub rate limit exhausted for {key}; retry in {retry_in:.0f}s")
+        self.key = key
+        self.retry_in = retry_in
+
+
+class _Budget:
+    __slots__ = (
+        "limit",
+        "remaining",
+        "reset_at",
+        "blocked_until",
+        "next_slot",
+        "requests",
+        "throttled",
+        "waited",
+        "rejected",
+    )
+
+    def __init__(self) -> None:
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.blocked_until: float = 0.0
+        self.next_slot: float = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.rejected = 0
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in": round(max(0.0, self.reset_at - now), 1) if self.reset_at else None,
+            "blocked_for": round(max(0.0, self.blocked_until - now), 1),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited, 3),
+            "rejected": self.rejected,
+        }
+
+
+def _header_int(response: httpx.Response, name: str) -> Optional[int]:
+    value = response.headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+class RateLimitGovernor:
+    def __init__(
+        self,
+        pacing_threshold: int = PACING_THRESHOLD,
+        low_watermark: int = LOW_WATERMARK,
+        max_wait: float = MAX_WAIT,
+    ) -> None:
+        self.pacing_threshold = pacing_threshold
+        self.low_watermark = low_watermark
+        self.max_wait = max_wait
+        self._budgets: Dict[str, _Budget] = {}
+        self.languages_skipped = 0
+
+    def _budget(self, key: str) -> _Budget:
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = _Budget()
+        return budget
+
+    def _pacing_threshold(self, budget: _Budget) -> int:
+        if budget.limit:
+            return min(self.pacing_threshold, int(budget.limit * PACING_FRACTION))
+        return self.pacing_threshold
+
+    def blocked_for(self, key: str) -> float:
+        """Seconds until ``key`` has budget again (Retry-After or exhausted until reset); 0 if usable."""
+        budget = self._budget(key)
+        now = time.time()
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+        if budget.remaining is not None and budget.remaining <= 0 and budget.reset_at > now:
+            return budget.reset_at - now
+        return 0.0
+
+    def delay_for(self, key: str) -> float:
+        """Pacing delay (at most max_wait) for the next request of ``key``; reserves its slot.
+
+        Only call it for a request that is going to be sent (see acquire).
+        """
+        budget = self._budget(key)
+        now = time.time()
+        if budget.remaining is None or budget.reset_at <= now:
+            return 0.0
+        if budget.remaining <= 0 or budget.remaining > self._pacing_threshold(budget):
+            return 0.0
+        interval = min((budget.reset_at - now) / budget.remaining, self.max_wait)
+        delay = min(max(0.0, budget.next_slot - now), self.max_wait)
+        budget.next_slot = now + delay + interval
+        return delay
+
+    async def acquire(self, key: str) -> None:
+        budget = self._budget(key)
+        blocked = self.blocked_for(key)
+        if blocked > self.max_wait:
+            # Sin presupuesto: se rechaza sin reservar turno en el reparto
+            budget.rejected += 1
+            raise RateLimitExceeded(key, blocked)
+        delay = blocked if blocked > 0 else self.delay_for(key)
+        if delay > 0:
+            budget.throttled += 1
+            budget.waited += delay
+            await asyncio.sleep(delay)
+        budget.requests += 1
+        if budget.remaining is not None and budget.remaining > 0:
+            # Descuento optimista hasta que llegue la cabecera real
+            budget.remaining -= 1
+
+    def observe(self, key: str, response: httpx.Response) -> None:
+        budget = self._budget(key)
+        limit = _header_int(response, "x-ratelimit-limit")
+        remaining = _header_int(response, "x-ratelimit-remaining")
+        reset = _header_int(response, "x-ratelimit-reset")
+        if limit is not None:
+            budget.limit = limit
+        if remaining is not None:
+            budget.remaining = remaining
+        if reset is not None:
+            if reset > budget.reset_at + 1:
+                budget.next_slot = 0.0
+            budget.reset_at = float(reset)
+
+        if response.status_code in (403, 429):
+            retry_after = _header_int(response, "retry-after")
+            now = time.time()
+            if retry_after is not None:
+                budget.blocked_until = max(budget.blocked_until, now + retry_after)
+            elif remaining == 0 and budget.reset_at > now:
+                budget.blocked_until = max(budget.blocked_until, budget.reset_at)
+
+    def remaining(self, key: str) -> Optional[int]:
+        budget = self._budgets.get(key)
+        if budget is None or (budget.reset_at and budget.reset_at <= time.time()):
+            return None
+        return budget.remaining
+
+    def limit(self, key: str) -> Optional[int]:
+        """Last X-RateLimit-Limit seen for ``key`` (None until the first response)."""
+        budget = self._budgets.get(key)
+        return budget.limit if budget is not None else None
+
+    def available_at(self, key: str) -> float:
+        """Epoch time at which ``key`` can be used again (0 if usable now)."""
+        budget = self._budgets.get(key)
+        if budget is None:
+            return 0.0
+        now = time.time()
+        if budget.blocked_until > now:
+            return budget.blocked_until
+        if budget.remaining is not None and budget.remaining <= 0 and budget.reset_at > now:
+            return budget.reset_at
+        return 0.0
+
+    def is_low(self, key: str) -> bool:
+        budget = self._budgets.get(key)
+        if budget is None:
+            return False
+        now = time.time()
+        if budget.blocked_until > now:
+            return True
+        if budget.remaining is None or budget.reset_at <= now:
+            return False
+        return budget.remaining <= self.low_watermark
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "pacing_threshold": self.pacing_threshold,
+            "pacing_fraction": PACING_FRACTION,
+            "low_watermark": self.low_watermark,
+            "max_wait": self.max_wait,
+            "languages_skipped": self.languages_skipped,
+            "budgets": {key: budget.snapshot(now) for key, budget in self._budgets.items()},
+        }
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+from collections import OrderedDict
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from app.metrics import stage
+
 try:
     from app.badges import build_badges as _build_badges
 except Exception:
@@ -48,8 +54,150 @@ TEMPLATES: Dict[str, Dict[str, Any]] = {
 }
 
 
+# Cachés de render: planes compilados por config y fragmentos por sección
+PLAN_CACHE_SIZE = int(os.getenv("README_PLAN_CACHE_SIZE", "256"))
+FRAGMENT_CACHE_SIZE = int(os.getenv("README_FRAGMENT_CACHE_SIZE", "4096"))
+
+# Campos del perfil que leen las secciones (huella del perfil, una por llamada)
+RENDER_PROFILE_FIELDS: Tuple[str, ...] = (
+    "username",
+    "name",
+    "bio",
+    "followers",
+    "public_repos",
+    "top_languages",
+    "repos",
+)
+
+# Claves de config que lee cada sección: cambiar otra opción no la vuelve a renderizar
+SECTION_CONFIG_KEYS: Dict[str, Tuple[str, ...]] = {
+    "header": ("subtitle", "tagline"),
+    "badges": ("style", "joiner", "badges", "colors", "language_badges"),
+    "bio": (),
+    "stats": (),
+    "languages": ("max_languages", "language_count", "show_language_percent"),
+    "repos": ("max_repos", "repo_count", "layout", "show_repo_stats"),
+    "charts": ("charts", "joiner", "theme", "hide_border", "stats", "top_languages", "streak"),
+}
+
+
+# Parte del perfil que necesita cada sección, en orden de llegada desde GitHub
+# (render progresivo de /api/generate/stream)
+PROFILE_PARTS: Tuple[str, ...] = ("user", "repos", "languages")
+SECTION_INPUTS: Dict[str, str] = {
+    "header": "user",
+    "bio": "user",
+    "stats": "user",
+    "charts": "user",
+    "repos": "repos",
+    "badges": "languages",
+    "languages": "languages",
+}
+
+
+class RenderPlan:
+    """Config already resolved: template applied, sections normalized, titles chosen."""
+
+    __slots__ = ("config", "has_header", "sections", "titles", "config_fps")
+
+    def __init__(self, config: Dict[str, Any], sections: List[str]) -> None:
+        self.config = config
+        self.has_header = "header" in sections
+        self.sections = tuple(section for section in sections if section != "header")
+        self.titles = {section: _section_title(section, config) for section in self.sections}
+        # Huella de las claves de config que lee cada sección (clave de sus fragmentos)
+        self.config_fps = {
+            section: _fingerprint([config.get(key) for key in SECTION_CONFIG_KEYS.get(section, ())])
+            for section in sections
+        }
+
+
+_plan_cache: "OrderedDict[str, RenderPlan]" = OrderedDict()
+_fragment_cache: "OrderedDict[Tuple[str, str, str], Tuple[Tuple[str, ...], Dict[str, Any]]]" = OrderedDict()
+render_cache_stats = {"plan_hits": 0, "plan_misses": 0, "fragment_hits": 0, "fragment_misses": 0}
+
+
 def build_readme(profile_data: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    with stage("build_readme"):
+        plan = compile_plan(config)
+        profile_fp = _fingerprint([profile_data.get(field) for field in RENDER_PROFILE_FIELDS])
+        lines: List[str] = []
+        assets: Dict[str, Any] = {}
+
+        if plan.has_header:
+            header, _ = _render_fragment("header", profile_data, profile_fp, plan)
+            lines.extend(header)
+
+        for section in plan.sections:
+            body, new_assets = _render_fragment(section, profile_data, profile_fp, plan)
+            assets = _merge_assets(assets, new_assets)
+            _append_section(lines, plan.titles[section], body)
+
+        markdown = "\n".join(lines).strip()
+        if markdown:
+            markdown += "\n"
+
+        result: Dict[str, Any] = {"markdown": markdown}
+        if assets:
+            result["assets"] = assets
+        return result
+
+
+def render_blocks(
+    profile_data: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+    parts: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """The README's sections as separate blocks, in README order.
+
+    Each block is ``{"section", "index", "markdown"}`` (plus ``assets`` when the
+    section has any); ``markdown`` includes the section title and is empty when
+    the section has nothing to show. Joining the non-empty blocks with a blank
+    line gives build_readme's markdown. With ``parts`` only the sections whose
+    input (SECTION_INPUTS) is one of those profile parts are rendered.
+    """
+    plan = compile_plan(config)
+    profile_fp = _fingerprint([profile_data.get(field) for field in RENDER_PROFILE_FIELDS])
+    wanted = set(parts) if parts is not None else set(PROFILE_PARTS)
+    order = (("header",) if plan.has_header else ()) + plan.sections
+
+    blocks: List[Dict[str, Any]] = []
+    for index, section in enumerate(order):
+        if SECTION_INPUTS.get(section, PROFILE_PARTS[-1]) not in wanted:
+            continue
+        body, assets = _render_fragment(section, profile_data, profile_fp, plan)
+        lines: List[str] = []
+        if section == "header":
+            lines.extend(body)
+        else:
+            _append_section(lines, plan.titles[section], body)
+        block: Dict[str, Any] = {"section": section, "index": index, "markdown": "\n".join(lines).strip()}
+        if assets:
+            block["assets"] = assets
+        blocks.append(block)
+    return blocks
+
+
+def compile_plan(config: Optional[Dict[str, Any]] = None) -> RenderPlan:
+    """RenderPlan for ``config``, cached by a hash of the config."""
     config = config or {}
+    key = _fingerprint(config)
+    if key is not None:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            render_cache_stats["plan_hits"] += 1
+            return plan
+    render_cache_stats["plan_misses"] += 1
+    plan = _compile_plan(config)
+    if key is not None and PLAN_CACHE_SIZE > 0:
+        _plan_cache[key] = plan
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def _compile_plan(config: Dict[str, Any]) -> RenderPlan:
     # Aplicar plantilla si se especifica
     template_name = (config.get("template") or "").strip().lower()
     if template_name in TEMPLATES:
@@ -64,45 +212,71 @@ def build_readme(profile_data: Dict[str, Any], config: Optional[Dict[str, Any]]
         sections = list(TEMPLATES.get(template_name, {}).get("sections", DEFAULT_SECTIONS) if template_name else DEFAULT_SECTIONS)
         if not sections:
             sections = list(DEFAULT_SECTIONS)
+    return RenderPlan(config, sections)
 
-    lines: List[str] = []
-    assets: Dict[str, Any] = {}
 
-    if "header" in sections:
-        lines.extend(_section_header(profile_data, config))
-
-    for section in sections:
-        if section == "header":
-            continue
+def clear_render_caches() -> None:
+    _plan_cache.clear()
+    _fragment_cache.clear()
 
-        if section == "badges":
-            body, new_assets = _section_badges(profile_data, config)
-            assets = _merge_assets(assets, new_assets)
-        elif section == "charts":
-            body, new_assets = _section_charts(profile_data, config)
-            assets = _merge_assets(assets, new_assets)
-        elif section == "bio":
-            body = _section_bio(profile_data)
-        elif section == "stats":
-            body = _section_stats(profile_data)
-        elif section == "languages":
-            body = _section_languages(profile_data, config)
-        elif section == "repos":
-            body = _section_repos(profile_data, config)
-        else:
-            body = []
 
-        title = _section_title(section, config)
-        _append_section(lines, title, body)
+def _fingerprint(value: Any) -> Optional[str]:
+    try:
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
 
-    markdown = "\n".join(lines).strip()
-    if markdown:
-        markdown += "\n"
 
-    result: Dict[str, Any] = {"markdown": markdown}
-    if assets:
-        result["assets"] = assets
-    return result
+def _render_fragment(
+    section: str,
+    profile_data: Dict[str, Any],
+    profile_fp: Optional[str],
+    plan: RenderPlan,
+) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """Rendered section memoized by (section, profile fingerprint, config keys it reads)."""
+    config = plan.config
+    config_fp = plan.config_fps.get(section)
+    if profile_fp is None or config_fp is None or FRAGMENT_CACHE_SIZE <= 0:
+        render_cache_stats["fragment_misses"] += 1
+        body, assets = _render_section(section, profile_data, config)
+        return tuple(body), assets
+
+    key = (section, profile_fp, config_fp)
+    cached = _fragment_cache.get(key)
+    if cached is not None:
+        _fragment_cache.move_to_end(key)
+        render_cache_stats["fragment_hits"] += 1
+        return cached
+    render_cache_stats["fragment_misses"] += 1
+    body, assets = _render_section(section, profile_data, config)
+    fragment = (tuple(body), assets)
+    _fragment_cache[key] = fragment
+    while len(_fragment_cache) > FRAGMENT_CACHE_SIZE:
+        _fragment_cache.popitem(last=False)
+    return fragment
+
+
+def _render_section(
+    section: str,
+    profile_data: Dict[str, Any],
+    config: Dict[str, Any],
+) -> Tuple[List[str], Dict[str, Any]]:
+    if section == "header":
+        return _section_header(profile_data, config), {}
+    if section == "badges":
+        return _section_badges(profile_data, config)
+    if section == "charts":
+        return _section_charts(profile_data, config)
+    if section == "bio":
+        return _section_bio(profile_data), {}
+    if section == "stats":
+        return _section_stats(profile_data), {}
+    if section == "languages":
+        return _section_languages(profile_data, config), {}
+    if section == "repos":
+        return _section_repos(profile_data, config), {}
+    return [], {}
 
 
 def _section_title(section: str, config: Dict[str, Any]) -> Optional[str]:
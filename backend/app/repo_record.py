@@ -0,0 +1,95 @@
+"""
+Compact repository records.
+
+GitHub returns ~100 fields per repository; profiles only read a dozen. Repo
+pages are projected into ``RepoRecord`` tuples as they arrive, so neither the
+per-request repo list nor the stored responses keep the full JSON.
+``summarize_repos`` computes the owned-repo totals in a single pass.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+
+class RepoRecord(NamedTuple):
+    name: Optional[str]
+    full_name: Optional[str]
+    html_url: Optional[str]
+    description: Optional[str]
+    stargazers_count: int
+    forks_count: int
+    language: Optional[str]
+    pushed_at: Optional[str]
+    updated_at: Optional[str]
+    fork: bool
+    open_issues_count: int
+    languages_url: Optional[str]
+
+    @classmethod
+    def from_json(cls, data: dict) -> "RepoRecord":
+        """Projection of a REST repository object (same defaults the assembler used on dicts)."""
+        return cls(
+            data.get("name"),
+            data.get("full_name"),
+            data.get("html_url"),
+            data.get("description"),
+            data.get("stargazers_count", 0),
+            data.get("forks_count", 0),
+            data.get("language"),
+            data.get("pushed_at"),
+            data.get("updated_at"),
+            data.get("fork", False),
+            data.get("open_issues_count", 0),
+            data.get("languages_url"),
+        )
+
+
+_FIELD_COUNT = len(RepoRecord._fields)
+
+
+def project_page(body: Any) -> List[RepoRecord]:
+    """Repo page body → records.
+
+    Accepts the REST JSON (list of objects), an already projected page, or one
+    read back from the disk tier (lists). Anything else is dropped.
+    """
+    if not isinstance(body, list):
+        return []
+    records: List[RepoRecord] = []
+    for item in body:
+        if isinstance(item, RepoRecord):
+            records.append(item)
+        elif isinstance(item, dict):
+            records.append(RepoRecord.from_json(item))
+        elif isinstance(item, (list, tuple)) and len(item) == _FIELD_COUNT:
+            records.append(RepoRecord(*item))
+    return records
+
+
+class RepoSummary(NamedTuple):
+    # Sin forks; si todos son forks, todos
+    owned: List[RepoRecord]
+    stars: int
+    forks: int
+    open_issues: int
+
+
+def summarize_repos(repos: Iterable[RepoRecord]) -> RepoSummary:
+    owned: List[RepoRecord] = []
+    forked: List[RepoRecord] = []
+    owned_totals = [0, 0, 0]
+    fork_totals = [0, 0, 0]
+    for repo in repos:
+        if repo.fork:
+            forked.append(repo)
+            totals = fork_totals
+        else:
+            owned.append(repo)
+            totals = owned_totals
+        totals[0] += repo.stargazers_count
+        totals[1] += repo.forks_count
+        totals[2] += repo.open_issues_count
+    if owned:
+        return RepoSummary(owned, *owned_totals)
+    return RepoSummary(forked, *fork_totals)
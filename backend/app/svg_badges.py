@@ -0,0 +1,209 @@
+"""
+Local SVG badge renderer (shields.io look-alike).
+
+Covers what badges.py emits: flat, flat-square and for-the-badge styles,
+shields named colors or hex, and the github logo. Text is measured with a
+Verdana 11px width table, so no font is needed at runtime. Rendered badges are
+memoized by (label, message, color, style, logo).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote_plus
+
+from app.readme_builder import _html_escape
+
+BADGE_CACHE_SIZE = int(os.getenv("BADGE_CACHE_SIZE", "4096"))
+
+STYLES = ("flat", "flat-square", "for-the-badge")
+LABEL_COLOR = "#555"
+
+NAMED_COLORS: Dict[str, str] = {
+    "brightgreen": "#4c1",
+    "green": "#97ca00",
+    "yellowgreen": "#a4a61d",
+    "yellow": "#dfb317",
+    "orange": "#fe7d37",
+    "red": "#e05d44",
+    "blue": "#007ec6",
+    "grey": "#555",
+    "gray": "#555",
+    "lightgrey": "#9f9f9f",
+    "lightgray": "#9f9f9f",
+    "blueviolet": "#8a2be2",
+    "success": "#4c1",
+    "important": "#fe7d37",
+    "critical": "#e05d44",
+    "informational": "#007ec6",
+    "inactive": "#9f9f9f",
+}
+
+# Anchos (px) de Verdana 11px para ASCII imprimible; el resto usa FALLBACK_WIDTH
+_VERDANA_11 = {
+    " ": 3.87, "!": 4.33, '"': 5.05, "#": 9.0, "$": 6.99, "%": 11.84, "&": 7.99, "'": 2.95,
+    "(": 4.99, ")": 4.99, "*": 6.99, "+": 9.0, ",": 4.0, "-": 4.99, ".": 4.0, "/": 4.99,
+    ":": 4.99, ";": 4.99, "<": 9.0, "=": 9.0, ">": 9.0, "?": 6.0, "@": 11.0,
+    "A": 7.52, "B": 7.54, "C": 7.68, "D": 8.48, "E": 6.96, "F": 6.32, "G": 8.53, "H": 8.27,
+    "I": 4.61, "J": 5.0, "K": 7.62, "L": 6.12, "M": 9.27, "N": 8.23, "O": 8.66, "P": 6.63,
+    "Q": 8.66, "R": 7.65, "S": 7.52, "T": 6.78, "U": 8.05, "V": 7.52, "W": 10.88, "X": 7.54,
+    "Y": 6.77, "Z": 7.54, "[": 4.99, "\\": 4.99, "]": 4.99, "^": 9.0, "_": 6.99, "`": 6.99,
+    "a": 6.61, "b": 6.85, "c": 5.73, "d": 6.85, "e": 6.55, "f": 3.87, "g": 6.85, "h": 6.96,
+    "i": 3.02, "j": 3.79, "k": 6.51, "l": 3.02, "m": 10.71, "n": 6.96, "o": 6.68, "p": 6.85,
+    "q": 6.85, "r": 4.69, "s": 5.73, "t": 4.33, "u": 6.96, "v": 6.51, "w": 8.98, "x": 6.51,
+    "y": 6.51, "z": 5.78, "{": 6.98, "|": 4.99, "}": 6.98, "~": 9.0,
+}
+_VERDANA_11.update({str(digit): 6.99 for digit in range(10)})
+FALLBACK_WIDTH = 8.0
+
+LOGOS: Dict[str, str] = {
+    "github": (
+        "M12 .297c-6.63 0-12 5.373-12 12 0 5.303 3.438 9.8 8.205 11.385.6.113.82-.258.82-.577 "
+        "0-.285-.01-1.04-.015-2.04-3.338.724-4.042-1.61-4.042-1.61C4.422 18.07 3.633 17.7 3.633 "
+        "17.7c-1.087-.744.084-.729.084-.729 1.205.084 1.838 1.236 1.838 1.236 1.07 1.835 2.809 "
+        "1.305 3.495.998.108-.776.417-1.305.76-1.605-2.665-.3-5.466-1.332-5.466-5.93 0-1.31.465-2.38 "
+        "1.235-3.22-.135-.303-.54-1.523.105-3.176 0 0 1.005-.322 3.3 1.23.96-.267 1.98-.399 "
+        "3-.405 1.02.006 2.04.138 3 .405 2.28-1.552 3.285-1.23 3.285-1.23.645 1.653.24 2.873.12 "
+        "3.176.765.84 1.23 1.91 1.23 3.22 0 4.61-2.805 5.625-5.475 5.92.42.36.81 1.096.81 2.22 "
+        "0 1.606-.015 2.896-.015 3.286 0 .315.21.69.825.57C20.565 22.092 24 17.592 24 12.297c0-6.627-5.373-12-12-12"
+    ),
+}
+
+_HEX = re.compile(r"^(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
+_CSS_NAME = re.compile(r"^[a-zA-Z]{1,30}$")
+# Separador de shields: un "-" suelto ("--" es un guion literal)
+_SEGMENT_SPLIT = re.compile(r"(?<!-)-(?!-)")
+
+
+def text_width(text: str, scale: float = 1.0) -> float:
+    return sum(_VERDANA_11.get(char, FALLBACK_WIDTH) for char in text) * scale
+
+
+def resolve_color(color: Optional[str], default: str = "#9f9f9f") -> str:
+    value = (color or "").strip().lstrip("#")
+    if not value:
+        return default
+    named = NAMED_COLORS.get(value.lower())
+    if named:
+        return named
+    if _HEX.match(value):
+        return f"#{value.lower()}"
+    if _CSS_NAME.match(value):
+        # Nombres CSS (p. ej. "purple") son válidos en fill
+        return value.lower()
+    return default
+
+
+def _logo_svg(logo: Optional[str], x: float, y: float, size: float) -> str:
+    path = LOGOS.get((logo or "").lower())
+    if path is None:
+        return ""
+    return (
+        f'<svg x="{x:.1f}" y="{y:.1f}" width="{size}" height="{size}" viewBox="0 0 24 24">'
+        f'<path fill="#fff" d="{path}"/></svg>'
+    )
+
+
+def _render(label: str, message: str, color: str, style: str, logo: Optional[str]) -> str:
+    style = style if style in STYLES else "flat"
+    big = style == "for-the-badge"
+    if big:
+        label, message = label.upper(), message.upper()
+        height, padding, font_size, spacing, weight = 28, 9.0, 10, 1.25, "bold"
+        # Verdana bold 10px ≈ 11px regular; más el espaciado entre letras
+        label_text = text_width(label) + spacing * len(label)
+        message_text = text_width(message) + spacing * len(message)
+    else:
+        height, padding, font_size, spacing, weight = 20, 5.0, 11, 0.0, "normal"
+        label_text = text_width(label)
+        message_text = text_width(message)
+
+    has_logo = (logo or "").lower() in LOGOS
+    logo_size = 14
+    logo_space = logo_size + (3 if label else 0) if has_logo else 0
+    label_width = (label_text + padding * 2 + logo_space) if (label or has_logo) else 0
+    message_width = message_text + padding * 2
+    width = label_width + message_width
+    fill = resolve_color(color)
+    title = f"{label}: {message}" if label else message
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height}" '
+        f'role="img" aria-label="{_html_escape(title)}"><title>{_html_escape(title)}</title>'
+    ]
+    if style == "flat":
+        parts.append(
+            '<linearGradient id="s" x2="0" y2="100%"><stop offset="0" stop-color="#bbb" stop-opacity=".1"/>'
+            '<stop offset="1" stop-opacity=".1"/></linearGradient>'
+            f'<clipPath id="r"><rect width="{width:.0f}" height="{height}" rx="3" fill="#fff"/></clipPath>'
+            '<g clip-path="url(#r)">'
+        )
+    else:
+        parts.append("<g>")
+    parts.append(
+        f'<rect width="{label_width:.1f}" height="{height}" fill="{LABEL_COLOR}"/>'
+        f'<rect x="{label_width:.1f}" width="{message_width:.1f}" height="{height}" fill="{fill}"/>'
+    )
+    if style == "flat":
+        parts.append(f'<rect width="{width:.0f}" height="{height}" fill="url(#s)"/>')
+    parts.append("</g>")
+
+    text_y = height / 2 + font_size * 0.35
+    parts.append(
+        f'<g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" '
+        f'font-size="{font_size}" font-weight="{weight}"'
+        + (f' letter-spacing="{spacing}"' if spacing else "")
+        + ">"
+    )
+    if has_logo:
+        parts.append(_logo_svg(logo, padding, (height - logo_size) / 2, logo_size))
+    if label:
+        label_x = padding + logo_space + label_text / 2
+        parts.append(f'<text x="{label_x:.1f}" y="{text_y:.1f}">{_html_escape(label)}</text>')
+    message_x = label_width + message_width / 2
+    parts.append(f'<text x="{message_x:.1f}" y="{text_y:.1f}">{_html_escape(message)}</text>')
+    parts.append("</g></svg>")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=BADGE_CACHE_SIZE)
+def render_badge(
+    label: str,
+    message: str,
+    color: str = "lightgrey",
+    style: str = "flat",
+    logo: Optional[str] = None,
+) -> str:
+    """Badge SVG; memoized by its arguments."""
+    return _render(label, message, color, style, logo)
+
+
+def _unescape_segment(segment: str) -> str:
+    text = unquote_plus(segment)
+    # Escapes de shields: "__" → "_", "_" → espacio, "--" → "-"
+    return text.replace("__", "\0").replace("_", " ").replace("\0", "_").replace("--", "-")
+
+
+def parse_shield_path(path: str) -> Optional[Tuple[str, str, str]]:
+    """(label, message, color) from a ``/badge/<label>-<message>-<color>`` path, or None."""
+    if not path.startswith("/badge/"):
+        return None
+    spec = path[len("/badge/"):]
+    if spec.endswith(".svg"):
+        spec = spec[:-4]
+    segments = _SEGMENT_SPLIT.split(spec)
+    if len(segments) == 2:
+        message, color = segments
+        return "", _unescape_segment(message), unquote_plus(color)
+    if len(segments) < 3:
+        return None
+    label = "-".join(segments[:-2])
+    return _unescape_segment(label), _unescape_segment(segments[-2]), unquote_plus(segments[-1])
+
+
+def badge_cache_stats() -> Dict[str, Any]:
+    info = render_badge.cache_info()
+    return {"entries": info.currsize, "max_entries": info.maxsize, "hits": info.hits, "misses": info.misses}
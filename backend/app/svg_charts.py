@@ -0,0 +1,279 @@
+"""
+Local SVG renderer for the stats and top-languages cards.
+
+Draws from the ProfileData we already fetched (``stats``, ``languages``) and
+honors the options charts.build_stats_chart / build_top_languages_chart put in
+their URLs (theme, layout, langs_count, hide_border), so previews never wait on
+github-readme-stats. Rendered SVGs are memoized by data + options.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.readme_builder import _html_escape
+
+SVG_CACHE_SIZE = int(os.getenv("SVG_CHART_CACHE_SIZE", "1024"))
+
+# Subconjunto de los temas de github-readme-stats: title, icon, text, bg, border
+THEMES: Dict[str, Dict[str, str]] = {
+    "default": {"title": "2f80ed", "icon": "4c71f2", "text": "434d58", "bg": "fffefe", "border": "e4e2e2"},
+    "light": {"title": "2f80ed", "icon": "4c71f2", "text": "434d58", "bg": "fffefe", "border": "e4e2e2"},
+    "dark": {"title": "fff", "icon": "79ff97", "text": "9f9f9f", "bg": "151515", "border": "e4e2e2"},
+    "radical": {"title": "fe428e", "icon": "f8d847", "text": "a9fef7", "bg": "141321", "border": "e4e2e2"},
+    "merko": {"title": "abd200", "icon": "b7d364", "text": "68b587", "bg": "0a0f0b", "border": "e4e2e2"},
+    "gruvbox": {"title": "fabd2f", "icon": "fe8019", "text": "8ec07c", "bg": "282828", "border": "e4e2e2"},
+    "tokyonight": {"title": "70a5fd", "icon": "bf91f3", "text": "38bdae", "bg": "1a1b27", "border": "e4e2e2"},
+    "onedark": {"title": "e4bf7a", "icon": "8eb573", "text": "df6d74", "bg": "282c34", "border": "e4e2e2"},
+    "cobalt": {"title": "e683d9", "icon": "0480ef", "text": "75eeb2", "bg": "193549", "border": "e4e2e2"},
+    "synthwave": {"title": "e2e9ec", "icon": "ef8539", "text": "e5289e", "bg": "2b213a", "border": "e4e2e2"},
+    "highcontrast": {"title": "e7f216", "icon": "00ffff", "text": "fff", "bg": "000", "border": "e4e2e2"},
+    "dracula": {"title": "ff6e96", "icon": "79dafa", "text": "f8f8f2", "bg": "282a36", "border": "e4e2e2"},
+}
+
+# Colores de linguist para los lenguajes más comunes; el resto se deriva del nombre
+LANGUAGE_COLORS: Dict[str, str] = {
+    "JavaScript": "#f1e05a",
+    "TypeScript": "#3178c6",
+    "Python": "#3572A5",
+    "Java": "#b07219",
+    "Go": "#00ADD8",
+    "Rust": "#dea584",
+    "C": "#555555",
+    "C++": "#f34b7d",
+    "C#": "#178600",
+    "PHP": "#4F5D95",
+    "Ruby": "#701516",
+    "Kotlin": "#A97BFF",
+    "Swift": "#F05138",
+    "Dart": "#00B4AB",
+    "Shell": "#89e051",
+    "HTML": "#e34c26",
+    "CSS": "#563d7c",
+    "SCSS": "#c6538c",
+    "Vue": "#41b883",
+    "Jupyter Notebook": "#DA5B0B",
+    "Dockerfile": "#384d54",
+    "Lua": "#000080",
+    "Scala": "#c22d40",
+    "Elixir": "#6e4a7e",
+    "Haskell": "#5e5086",
+}
+
+CARD_WIDTH = 467
+LANG_CARD_WIDTH = 300
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+svg_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _color(value: str) -> str:
+    return value if value.startswith("#") else f"#{value}"
+
+
+def resolve_theme(theme: Optional[str]) -> Dict[str, str]:
+    colors = THEMES.get((theme or "default").strip().lower(), THEMES["default"])
+    return {key: _color(value) for key, value in colors.items()}
+
+
+def language_color(name: str) -> str:
+    known = LANGUAGE_COLORS.get(name)
+    if known:
+        return known
+    digest = hashlib.md5(name.encode("utf-8")).hexdigest()
+    return f"#{digest[:6]}"
+
+
+def _frame(width: int, height: int, colors: Mapping[str, str], hide_border: bool, title: str, body: str) -> str:
+    stroke = "none" if hide_border else colors["border"]
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" fill="none" role="img" aria-label="{_html_escape(title)}">'
+        f"<title>{_html_escape(title)}</title>"
+        "<style>"
+        f".header{{font:600 18px 'Segoe UI',Ubuntu,Sans-Serif;fill:{colors['title']}}}"
+        f".stat{{font:600 14px 'Segoe UI',Ubuntu,Sans-Serif;fill:{colors['text']}}}"
+        f".lang{{font:400 11px 'Segoe UI',Ubuntu,Sans-Serif;fill:{colors['text']}}}"
+        f".icon{{fill:{colors['icon']}}}"
+        "</style>"
+        f'<rect x="0.5" y="0.5" rx="4.5" width="{width - 1}" height="{height - 1}" '
+        f'fill="{colors["bg"]}" stroke="{stroke}" stroke-opacity="1"/>'
+        f'<text x="25" y="35" class="header">{_html_escape(title)}</text>'
+        f"{body}</svg>"
+    )
+
+
+def _format_number(value: Any) -> str:
+    try:
+        number = int(value or 0)
+    except (TypeError, ValueError):
+        return "0"
+    if number >= 1000:
+        return f"{number / 1000:.1f}k".replace(".0k", "k")
+    return str(number)
+
+
+def _display_name(profile: Mapping[str, Any]) -> str:
+    name = profile.get("name")
+    if isinstance(name, str) and name.strip():
+        return name.strip()
+    return str(profile.get("username") or "GitHub")
+
+
+def _render_stats(profile: Mapping[str, Any], theme: Optional[str], hide_border: bool, show_icons: bool) -> str:
+    colors = resolve_theme(theme)
+    stats = profile.get("stats") if isinstance(profile.get("stats"), dict) else {}
+    rows: List[Tuple[str, Any]] = [
+        ("Total Stars", stats.get("total_stars")),
+        ("Total Forks", stats.get("total_forks")),
+        ("Followers", stats.get("followers", profile.get("followers"))),
+        ("Public Repos", stats.get("public_repos", profile.get("public_repos"))),
+        ("Open Issues", stats.get("total_open_issues")),
+    ]
+    parts: List[str] = []
+    for index, (label, value) in enumerate(rows):
+        y = 70 + index * 25
+        label_x = 25
+        if show_icons:
+            parts.append(f'<circle cx="33" cy="{y - 5}" r="5" class="icon"/>')
+            label_x = 48
+        parts.append(f'<text x="{label_x}" y="{y}" class="stat">{label}:</text>')
+        parts.append(f'<text x="260" y="{y}" class="stat">{_format_number(value)}</text>')
+    title = f"{_display_name(profile)}'s GitHub Stats"
+    height = 70 + len(rows) * 25
+    return _frame(CARD_WIDTH, height, colors, hide_border, title, "".join(parts))
+
+
+def _languages(profile: Mapping[str, Any], langs_count: int) -> List[Tuple[str, float]]:
+    items: List[Tuple[str, float]] = []
+    languages = profile.get("languages")
+    if isinstance(languages, list) and languages:
+        for item in languages:
+            if isinstance(item, dict) and item.get("name"):
+                items.append((str(item["name"]), float(item.get("bytes") or 0)))
+    else:
+        for item in profile.get("top_languages") or []:
+            if isinstance(item, (list, tuple)) and len(item) >= 2 and item[0]:
+                items.append((str(item[0]), float(item[1] or 0)))
+    items.sort(key=lambda pair: pair[1], reverse=True)
+    return items[:langs_count]
+
+
+def _render_top_languages(
+    profile: Mapping[str, Any],
+    layout: str,
+    langs_count: int,
+    theme: Optional[str],
+    hide_border: bool,
+) -> str:
+    colors = resolve_theme(theme)
+    languages = _languages(profile, langs_count)
+    total = sum(value for _, value in languages) or 1.0
+    title = "Most Used Languages"
+    parts: List[str] = []
+
+    if layout == "compact":
+        bar_width = LANG_CARD_WIDTH - 50
+        parts.append(f'<clipPath id="bar"><rect x="25" y="55" width="{bar_width}" height="8" rx="5"/></clipPath>')
+        x = 25.0
+        for name, value in languages:
+            width = bar_width * value / total
+            parts.append(
+                f'<rect clip-path="url(#bar)" x="{x:.2f}" y="55" width="{width:.2f}" height="8" '
+                f'fill="{language_color(name)}"/>'
+            )
+            x += width
+        for index, (name, value) in enumerate(languages):
+            column, row = index % 2, index // 2
+            lx = 25 + column * 130
+            ly = 85 + row * 22
+            parts.append(f'<circle cx="{lx + 5}" cy="{ly - 4}" r="5" fill="{language_color(name)}"/>')
+            parts.append(
+                f'<text x="{lx + 15}" y="{ly}" class="lang">{_html_escape(name)} {value / total * 100:.2f}%</text>'
+            )
+        height = 85 + ((len(languages) + 1) // 2) * 22
+    else:
+        bar_width = LANG_CARD_WIDTH - 50
+        for index, (name, value) in enumerate(languages):
+            y = 60 + index * 40
+            percent = value / total * 100
+            parts.append(f'<text x="25" y="{y}" class="lang">{_html_escape(name)}</text>')
+            parts.append(f'<text x="{LANG_CARD_WIDTH - 25}" y="{y}" text-anchor="end" class="lang">{percent:.2f}%</text>')
+            parts.append(f'<rect x="25" y="{y + 8}" width="{bar_width}" height="8" rx="5" fill="#ddd"/>')
+            parts.append(
+                f'<rect x="25" y="{y + 8}" width="{bar_width * value / total:.2f}" height="8" rx="5" '
+                f'fill="{language_color(name)}"/>'
+            )
+        height = 60 + len(languages) * 40
+    if not languages:
+        parts.append('<text x="25" y="70" class="lang">No language data</text>')
+        height = 95
+    return _frame(LANG_CARD_WIDTH, height, colors, hide_border, title, "".join(parts))
+
+
+def _memoized(kind: str, data: Any, options: Tuple[Any, ...], render) -> str:
+    try:
+        encoded = json.dumps([kind, data, list(options)], sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return render()
+    key = hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        svg_cache_stats["hits"] += 1
+        return cached
+    svg_cache_stats["misses"] += 1
+    svg = render()
+    if SVG_CACHE_SIZE > 0:
+        _cache[key] = svg
+        while len(_cache) > SVG_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return svg
+
+
+def render_stats_card(
+    profile: Mapping[str, Any],
+    *,
+    theme: Optional[str] = None,
+    hide_border: bool = True,
+    show_icons: bool = True,
+) -> str:
+    data = [profile.get("username"), profile.get("name"), profile.get("followers"),
+            profile.get("public_repos"), profile.get("stats")]
+    return _memoized(
+        "stats",
+        data,
+        (theme, hide_border, show_icons),
+        lambda: _render_stats(profile, theme, hide_border, show_icons),
+    )
+
+
+def render_top_languages_card(
+    profile: Mapping[str, Any],
+    *,
+    layout: Optional[str] = "compact",
+    langs_count: int = 8,
+    theme: Optional[str] = None,
+    hide_border: bool = True,
+) -> str:
+    layout = (layout or "normal").strip().lower()
+    langs_count = max(1, min(int(langs_count), 20))
+    data = [profile.get("languages"), profile.get("top_languages")]
+    return _memoized(
+        "top_languages",
+        data,
+        (layout, langs_count, theme, hide_border),
+        lambda: _render_top_languages(profile, layout, langs_count, theme, hide_border),
+    )
+
+
+def clear_chart_cache() -> None:
+    _cache.clear()
+
+
+def svg_chart_stats() -> Dict[str, Any]:
+    return {"entries": len(_cache), "max_entries": SVG_CACHE_SIZE, **svg_cache_stats}
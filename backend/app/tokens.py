@@ -0,0 +1,133 @@
+"""
+Pool of GitHub tokens with budget-aware selection.
+
+Tokens come from GITHUB_TOKENS (comma separated), GITHUB_TOKENS_FILE (one per
+line, ``#`` comments allowed) and GITHUB_TOKEN. Each request uses the token
+with the most remaining budget; exhausted tokens are parked until their reset.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from app.rate_limit import RateLimitGovernor
+
+ANONYMOUS = "anonymous"
+
+
+def _label(token: str) -> str:
+    # Nunca exponemos el token: solo un prefijo de su hash
+    return f"token-{hashlib.sha256(token.encode()).hexdigest()[:8]}"
+
+
+def _read_tokens_file(path: str) -> List[str]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+    except OSError:
+        return []
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
+def load_tokens() -> List[str]:
+    tokens: List[str] = []
+    raw = os.getenv("GITHUB_TOKENS", "")
+    tokens.extend(item.strip() for item in raw.split(",") if item.strip())
+    path = os.getenv("GITHUB_TOKENS_FILE")
+    if path:
+        tokens.extend(_read_tokens_file(path))
+    single = os.getenv("GITHUB_TOKEN")
+    if single and single.strip():
+        tokens.append(single.strip())
+    unique: List[str] = []
+    for token in tokens:
+        if token not in unique:
+            unique.append(token)
+    return unique
+
+
+class TokenPool:
+    def __init__(self, tokens: List[str], governor: RateLimitGovernor) -> None:
+        self._tokens = list(tokens)
+        self._labels = {token: _label(token) for token in self._tokens}
+        self._governor = governor
+        self._cursor = 0
+        self._selected: Dict[str, int] = {label: 0 for label in self._labels.values()}
+
+    @classmethod
+    def from_env(cls, governor: RateLimitGovernor) -> "TokenPool":
+        return cls(load_tokens(), governor)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def budget_key(self, token: Optional[str], resource: str = "core") -> str:
+        label = self._labels.get(token, ANONYMOUS) if token else ANONYMOUS
+        return f"{label}:{resource}"
+
+    def select(self, resource: str = "core") -> Optional[str]:
+        """Token with the most remaining budget; round-robin between ties.
+
+        Parked tokens (exhausted or blocked by Retry-After) are skipped; if all
+        are parked, the one that becomes available first is returned.
+        """
+        if not self._tokens:
+            return None
+        now = time.time()
+        count = len(self._tokens)
+        start = self._cursor
+        self._cursor = (self._cursor + 1) % count
+
+        best: Optional[str] = None
+        best_remaining = -1
+        soonest: Optional[str] = None
+        soonest_at = float("inf")
+        for offset in range(count):
+            token = self._tokens[(start + offset) % count]
+            key = self.budget_key(token, resource)
+            available_at = self._governor.available_at(key)
+            if available_at > now:
+                if available_at < soonest_at:
+                    soonest, soonest_at = token, available_at
+                continue
+            remaining = self._governor.remaining(key)
+            # Sin datos todavía: se asume presupuesto completo
+            score = remaining if remaining is not None else 1 << 30
+            if score > best_remaining:
+                best, best_remaining = token, score
+
+        chosen = best if best is not None else soonest
+        if chosen is not None:
+            self._selected[self._labels[chosen]] += 1
+        return chosen
+
+    def limit(self, resource: str = "core") -> Optional[int]:
+        """Combined hourly limit of the pool (None until GitHub has reported one)."""
+        tokens = self._tokens or [None]
+        limits = [self._governor.limit(self.budget_key(token, resource)) for token in tokens]
+        known = [value for value in limits if value is not None]
+        return sum(known) if known else None
+
+    def is_low(self, resource: str = "core") -> bool:
+        """True when every token (or the anonymous budget) is nearly spent."""
+        if not self._tokens:
+            return self._governor.is_low(self.budget_key(None, resource))
+        return all(self._governor.is_low(self.budget_key(token, resource)) for token in self._tokens)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        tokens = []
+        for token in self._tokens:
+            label = self._labels[token]
+            key = self.budget_key(token)
+            available_at = self._governor.available_at(key)
+            tokens.append({
+                "label": label,
+                "selected": self._selected[label],
+                "remaining": self._governor.remaining(key),
+                "parked_for": round(available_at - now, 1) if available_at > now else 0.0,
+            })
+        return {"size": len(self._tokens), "tokens": tokens}
@@ -0,0 +1,187 @@
+"""
+Lightweight per-request tracing.
+
+With TRACING_ENABLED, every HTTP request gets a span tree (GitHub requests,
+repo pages, language calls, rendering; every metrics.stage() is a span too),
+summarized in a ``Server-Timing`` response header. With TRACE_EXPORT_PATH each
+finished trace is appended as one OTLP/JSON line (``resourceSpans``), the shape
+the OpenTelemetry Collector's otlpjsonfile receiver reads.
+
+Disabled (the default), ``span()`` is a context-variable lookup returning a
+shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH") or None
+SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "readme-generator")
+
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_SERVER_TIMING_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error = False
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self, trace_id: str, kind: int) -> Dict[str, Any]:
+        return {
+            "traceId": trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2 if self.error else 0},
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Trace:
+    """Spans of one request; the root span is the request itself."""
+
+    def __init__(self, name: str, traceparent: Optional[str] = None, **attributes: Any) -> None:
+        parent_id = None
+        match = _TRACEPARENT.match((traceparent or "").strip().lower())
+        if match:
+            self.trace_id, parent_id = match.group(1), match.group(2)
+        else:
+            self.trace_id = secrets.token_hex(16)
+        self.root = Span(name, parent_id, dict(attributes))
+        self.spans: List[Span] = [self.root]
+
+    def finish(self) -> None:
+        self.root.end_ns = time.time_ns()
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` value: total plus the summed duration and count per span name."""
+        totals: Dict[str, List[float]] = {}
+        for item in self.spans[1:]:
+            entry = totals.setdefault(item.name, [0.0, 0])
+            entry[0] += item.duration_ms
+            entry[1] += 1
+        parts = [f"total;dur={self.root.duration_ms:.1f}"]
+        for name, (duration, count) in totals.items():
+            metric = _SERVER_TIMING_NAME.sub("_", name)
+            parts.append(f'{metric};dur={duration:.1f};desc="{int(count)}x"' if count > 1 else f"{metric};dur={duration:.1f}")
+        return ", ".join(parts)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        spans = [
+            item.to_otlp(self.trace_id, 2 if item is self.root else 1)
+            for item in self.spans
+        ]
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": spans}],
+            }]
+        }
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_parent: ContextVar[Optional[Span]] = ContextVar("parent_span", default=None)
+_export_lock = threading.Lock()
+
+
+class _NoopSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class _SpanScope:
+    __slots__ = ("trace", "span", "token")
+
+    def __init__(self, trace: Trace, name: str, attributes: Dict[str, Any]) -> None:
+        parent = _parent.get() or trace.root
+        self.trace = trace
+        self.span = Span(name, parent.span_id, attributes)
+
+    def __enter__(self) -> Span:
+        self.trace.spans.append(self.span)
+        self.token = _parent.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.span.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.span.error = True
+            self.span.attributes["exception.type"] = exc_type.__name__
+        _parent.reset(self.token)
+
+
+def span(name: str, **attributes: Any):
+    """``with span("github_request", url=...) as s:`` — child of the current span; no-op outside a trace."""
+    trace = _trace.get()
+    if trace is None:
+        return _NOOP
+    return _SpanScope(trace, name, attributes)
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes: Any) -> Optional[Trace]:
+    """Activates a new trace in the current context (None when tracing is disabled)."""
+    if not TRACING_ENABLED:
+        return None
+    trace = Trace(name, traceparent, **attributes)
+    _trace.set(trace)
+    _parent.set(trace.root)
+    return trace
+
+
+def _append(path: str, line: str) -> None:
+    with _export_lock:
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+async def export(trace: Trace) -> None:
+    """Appends ``trace`` to TRACE_EXPORT_PATH; the file write runs in a worker thread."""
+    if TRACE_EXPORT_PATH is None:
+        return
+    # Se serializa en el bucle: las tareas en segundo plano aún pueden añadir spans
+    line = json.dumps(trace.to_otlp(), separators=(",", ":"))
+    await asyncio.to_thread(_append, TRACE_EXPORT_PATH, line)
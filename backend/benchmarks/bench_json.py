@@ -0,0 +1,114 @@
+"""
+JSON encode/decode throughput: stdlib json vs orjson (app/jsonutil.py).
+
+    cd backend
+    python -m benchmarks.bench_json [--iterations 500] [--repos 100] [--languages 80]
+
+enc_* : a large ProfileData (all repos in the payload, many languages).
+        enc_api is the previous path (jsonable_encoder + JSONResponse),
+        enc_json / enc_orjson are FastJSONResponse's render with each backend.
+dec_* : a GitHub repo page with full REST objects (~100 fields each),
+        parsed and projected to RepoRecords as github_client does.
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import jsonutil
+from app.repo_record import project_page
+from benchmarks.bench_readme import _time
+
+
+def large_profile(repo_count: int, language_count: int) -> Dict[str, Any]:
+    languages = [
+        {"name": f"Lang{i}", "bytes": 5_000_000 // (i + 1), "percentage": round(100 / (i + 2), 2)}
+        for i in range(language_count)
+    ]
+    repos = [
+        {
+            "name": f"repo-{i}",
+            "url": f"https://github.com/octocat/repo-{i}",
+            "description": f"Repository number {i}: tools, experiments and notes ✨",
+            "stars": i * 7,
+            "forks": i,
+            "language": f"Lang{i % language_count}",
+            "updated_at": "2024-05-01T12:00:00Z",
+            "is_fork": False,
+        }
+        for i in range(repo_count)
+    ]
+    return {
+        "username": "octocat",
+        "name": "The Octocat",
+        "bio": "Building things.",
+        "followers": 12034,
+        "public_repos": repo_count,
+        "avatar_url": "https://avatars.githubusercontent.com/u/583231",
+        "profile_url": "https://github.com/octocat",
+        "stats": {"followers": 12034, "following": 9, "public_repos": repo_count, "total_stars": 4321},
+        "languages": languages,
+        "top_languages": [[item["name"], item["bytes"]] for item in languages[:10]],
+        "repos": repos,
+    }
+
+
+def github_repo_page(repo_count: int) -> bytes:
+    page: List[Dict[str, Any]] = []
+    for i in range(repo_count):
+        base = f"https://api.github.com/repos/octocat/repo-{i}"
+        repo: Dict[str, Any] = {f"extra{k}_url": f"{base}/extra{k}{{/sha}}" for k in range(70)}
+        repo.update({
+            "id": 1000 + i,
+            "name": f"repo-{i}",
+            "full_name": f"octocat/repo-{i}",
+            "html_url": f"https://github.com/octocat/repo-{i}",
+            "description": f"Repository number {i}",
+            "stargazers_count": i * 7,
+            "forks_count": i,
+            "language": "Python",
+            "pushed_at": "2024-05-01T12:00:00Z",
+            "updated_at": "2024-05-01T12:00:00Z",
+            "fork": i % 7 == 6,
+            "open_issues_count": i % 5,
+            "languages_url": f"{base}/languages",
+            "owner": {"login": "octocat", "id": 583231, "type": "User", "site_admin": False},
+            "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT"},
+            "topics": ["cli", "python", "tools"],
+        })
+        page.append(repo)
+    return jsonutil.stdlib_dumps(page)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--repos", type=int, default=100)
+    parser.add_argument("--languages", type=int, default=80)
+    args = parser.parse_args()
+    n = args.iterations
+
+    profile = large_profile(args.repos, args.languages)
+    page = github_repo_page(args.repos)
+    print(f"backend: {jsonutil.BACKEND}; profile {len(jsonutil.stdlib_dumps(profile))} bytes, page {len(page)} bytes")
+
+    fastapi_us = _time("enc_api", n, lambda _: JSONResponse(jsonable_encoder(profile)))
+    stdlib_us = _time("enc_json", n, lambda _: jsonutil.stdlib_dumps(profile))
+    dec_stdlib_us = _time("dec_json", n, lambda _: project_page(jsonutil.stdlib_loads(page)))
+    if jsonutil.orjson is None:
+        print("orjson not installed: the app uses the stdlib path")
+        return
+    orjson_us = _time("enc_orjson", n, lambda _: jsonutil.dumps(profile))
+    dec_orjson_us = _time("dec_orjson", n, lambda _: project_page(jsonutil.loads(page)))
+    print(
+        f"encode: {fastapi_us / orjson_us:.1f}x vs fastapi, {stdlib_us / orjson_us:.1f}x vs stdlib   "
+        f"decode: {dec_stdlib_us / dec_orjson_us:.1f}x vs stdlib"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cold vs warm README generation.
+
+    cd backend
+    python -m benchmarks.bench_readme [--iterations 2000]
+
+cold   : render caches cleared before every call (old behaviour)
+warm   : same profile + config repeated (plan and every fragment cached)
+toggle : one option flipped each call (only the affected section re-renders)
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from app.readme_builder import build_readme, clear_render_caches, render_cache_stats
+
+
+def sample_profile(repo_count: int = 12, language_count: int = 10) -> Dict[str, Any]:
+    return {
+        "username": "octocat",
+        "name": "The Octocat",
+        "bio": "Building things.\nMostly cats.",
+        "followers": 12034,
+        "public_repos": 88,
+        "top_languages": [[f"Lang{i}", 100_000 // (i + 1)] for i in range(language_count)],
+        "repos": [
+            {
+                "name": f"repo-{i}",
+                "url": f"https://github.com/octocat/repo-{i}",
+                "description": f"Repository number {i} <with> & markup",
+                "stars": i * 7,
+                "forks": i,
+                "language": f"Lang{i % language_count}",
+            }
+            for i in range(repo_count)
+        ],
+    }
+
+
+def _time(label: str, iterations: int, fn: Callable[[int], None]) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    elapsed = time.perf_counter() - started
+    per_call = elapsed / iterations * 1e6
+    print(f"{label:<10} {iterations:>7} calls  {per_call:9.1f} us/call  {iterations / elapsed:10.0f} calls/s")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    profile = sample_profile()
+    config: Dict[str, Any] = {"template": "professional", "layout": "table", "theme": "dark"}
+
+    def cold(_: int) -> None:
+        clear_render_caches()
+        build_readme(profile, config)
+
+    def warm(_: int) -> None:
+        build_readme(profile, config)
+
+    def toggle(i: int) -> None:
+        build_readme(profile, {**config, "show_language_percent": bool(i % 2)})
+
+    cold_us = _time("cold", args.iterations, cold)
+    clear_render_caches()
+    warm_us = _time("warm", args.iterations, warm)
+    toggle_us = _time("toggle", args.iterations, toggle)
+    print(f"warm speedup: {cold_us / warm_us:.1f}x   toggle speedup: {cold_us / toggle_us:.1f}x")
+    print(f"cache stats: {render_cache_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmarks for the renderers.
+
+    cd backend
+    python -m benchmarks.bench_render [--iterations 5000]
+
+build_badges / build_charts build the markdown for their sections;
+render_badge / stats_card / top_langs_card are the local SVG renderers
+(memoized, so "cold" clears their caches before every call).
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any, Dict
+
+from app.badges import build_badges
+from app.charts import build_charts
+from app.readme_builder import build_readme, clear_render_caches
+from app.svg_badges import render_badge
+from app.svg_charts import clear_chart_cache, render_stats_card, render_top_languages_card
+from benchmarks.bench_readme import _time, sample_profile
+
+
+def _profile() -> Dict[str, Any]:
+    profile = sample_profile()
+    profile["stats"] = {
+        "followers": profile["followers"],
+        "following": 10,
+        "public_repos": profile["public_repos"],
+        "public_gists": 2,
+        "total_stars": 4321,
+        "total_forks": 210,
+        "total_open_issues": 17,
+    }
+    profile["languages"] = [
+        {"name": name, "bytes": amount, "percentage": 0.0} for name, amount in profile["top_languages"]
+    ]
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    profile = _profile()
+    badge_config: Dict[str, Any] = {"badges": ["profile", "followers", "repos", "top_language", "languages"]}
+    chart_config: Dict[str, Any] = {"charts": ["stats", "top_languages", "streak"], "theme": "dark"}
+    readme_config: Dict[str, Any] = {"template": "professional", "layout": "table", "theme": "dark"}
+
+    def readme_cold(_: int) -> None:
+        clear_render_caches()
+        build_readme(profile, readme_config)
+
+    def badge_cold(i: int) -> None:
+        render_badge("Followers", str(i), "blue", "flat", None)
+
+    def stats_cold(_: int) -> None:
+        clear_chart_cache()
+        render_stats_card(profile, theme="dark")
+
+    def langs_cold(_: int) -> None:
+        clear_chart_cache()
+        render_top_languages_card(profile, layout="compact", langs_count=8)
+
+    _time("readme", n, readme_cold)
+    _time("badges", n, lambda _: build_badges(profile, badge_config))
+    _time("charts", n, lambda _: build_charts(profile, chart_config))
+    render_badge.cache_clear()
+    _time("badge_svg", n, badge_cold)
+    _time("badge_hit", n, lambda _: render_badge("Followers", "1", "blue", "flat", None))
+    _time("stats_svg", n, stats_cold)
+    _time("langs_svg", n, langs_cold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Local GitHub API simulator for benchmarks and load tests.
+
+    cd backend
+    python -m benchmarks.fake_github --port 9100 --latency-ms 80 --repos 60
+
+Serves the endpoints the backend uses (``/users/{login}``,
+``/users/{login}/repos``, ``/repos/{owner}/{repo}/languages``, ``/graphql``)
+with deterministic data per login, ETag / 304 handling, X-RateLimit-* headers
+from a shared budget, optional latency and error injection, plus
+``/image.svg`` for the image proxy. ``GET /_stats`` returns request counters;
+``POST /_reset`` clears them and refills the budget. Logins starting with
+``missing`` return 404.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+LANGUAGES = [
+    "Python", "TypeScript", "JavaScript", "Go", "Rust", "Java", "C++", "C", "Shell", "HTML",
+    "CSS", "Ruby", "Kotlin", "Swift", "Dart", "Lua", "Scala", "Elixir", "Haskell", "Vue",
+]
+
+IMAGE_SVG = (
+    b'<svg xmlns="http://www.w3.org/2000/svg" width="120" height="20">'
+    b'<rect width="120" height="20" fill="#4c1"/></svg>'
+)
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    repos: int = 40
+    languages: int = 5
+    rate_limit: int = 5000
+    error_rate: float = 0.0
+    seed: int = 1
+
+
+def _seed(*parts: str) -> int:
+    return int(hashlib.sha1("/".join(parts).encode()).hexdigest()[:8], 16)
+
+
+def _user(login: str, config: FakeConfig, base: str) -> Dict[str, Any]:
+    seed = _seed(login)
+    return {
+        "login": login,
+        "name": login.title(),
+        "bio": f"Fake profile for {login}",
+        "followers": seed % 5000,
+        "following": seed % 97,
+        "public_repos": config.repos,
+        "public_gists": seed % 13,
+        "avatar_url": f"{base}/image.svg?avatar={login}",
+        "html_url": f"https://github.com/{login}",
+    }
+
+
+def _repo(login: str, index: int, config: FakeConfig, base: str) -> Dict[str, Any]:
+    seed = _seed(login, str(index))
+    name = f"repo-{index}"
+    return {
+        "name": name,
+        "full_name": f"{login}/{name}",
+        "html_url": f"https://github.com/{login}/{name}",
+        "description": f"Repository {index} of {login}",
+        "stargazers_count": seed % 500,
+        "forks_count": seed % 40,
+        "language": LANGUAGES[seed % len(LANGUAGES)],
+        "fork": index % 7 == 6,
+        "open_issues_count": seed % 9,
+        "pushed_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "languages_url": f"{base}/repos/{login}/{name}/languages",
+    }
+
+
+def _languages(owner: str, repo: str, config: FakeConfig) -> Dict[str, int]:
+    seed = _seed(owner, repo)
+    count = max(1, config.languages)
+    return {
+        LANGUAGES[(seed + offset) % len(LANGUAGES)]: (seed >> (offset % 16)) % 200_000 + 1_000
+        for offset in range(count)
+    }
+
+
+class FakeGitHub:
+    def __init__(self, config: FakeConfig) -> None:
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.remaining = config.rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.counts: Dict[str, int] = {}
+
+    def count(self, kind: str, api_call: bool = True) -> None:
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        if api_call:
+            self.counts["total"] = self.counts.get("total", 0) + 1
+
+    async def delay(self) -> None:
+        latency = self.config.latency_ms + self.random.uniform(-1, 1) * self.config.jitter_ms
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    def rate_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.config.rate_limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Resource": "core",
+        }
+
+    async def respond(self, request: Request, kind: str, payload: Any, status: int = 200) -> Response:
+        self.count(kind)
+        await self.delay()
+        if self.config.error_rate and self.random.random() < self.config.error_rate:
+            self.count("injected_errors", api_call=False)
+            return JSONResponse({"message": "Injected failure"}, status_code=502)
+        if self.remaining <= 0:
+            self.count("rate_limited", api_call=False)
+            headers = {**self.rate_headers(), "Retry-After": "60"}
+            return JSONResponse({"message": "API rate limit exceeded"}, status_code=403, headers=headers)
+
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if status == 200 and request.headers.get("if-none-match") == etag:
+            # Como GitHub: un 304 no consume presupuesto
+            self.count("not_modified", api_call=False)
+            return Response(status_code=304, headers={**self.rate_headers(), "ETag": etag})
+        self.remaining -= 1
+        headers = self.rate_headers()
+        if status == 200:
+            headers["ETag"] = etag
+        return Response(body, status_code=status, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"counts": dict(self.counts), "remaining": self.remaining}
+
+    def reset(self) -> None:
+        self.counts.clear()
+        self.remaining = self.config.rate_limit
+        self.reset_at = int(time.time()) + 3600
+
+
+def _graphql_user(login: str, variables: Dict[str, Any], config: FakeConfig, base: str) -> Dict[str, Any]:
+    first = int(variables.get("first") or 100)
+    offset = int(variables.get("after") or 0)
+    end = min(config.repos, offset + first)
+    nodes = []
+    for index in range(offset, end):
+        repo = _repo(login, index, config, base)
+        node: Dict[str, Any] = {
+            "name": repo["name"],
+            "nameWithOwner": repo["full_name"],
+            "url": repo["html_url"],
+            "description": repo["description"],
+            "stargazerCount": repo["stargazers_count"],
+            "forkCount": repo["forks_count"],
+            "isFork": repo["fork"],
+            "pushedAt": repo["pushed_at"],
+            "updatedAt": repo["updated_at"],
+            "primaryLanguage": {"name": repo["language"]},
+            "issues": {"totalCount": repo["open_issues_count"]},
+            "pullRequests": {"totalCount": 0},
+        }
+        if variables.get("withLanguages"):
+            languages = _languages(login, repo["name"], config)
+            node["languages"] = {"edges": [{"size": size, "node": {"name": name}} for name, size in languages.items()]}
+        nodes.append(node)
+    user: Dict[str, Any] = {
+        "login": login,
+        "repositories": {
+            "pageInfo": {"hasNextPage": end < config.repos, "endCursor": str(end)},
+            "nodes": nodes,
+        },
+    }
+    if variables.get("withUser"):
+        rest = _user(login, config, base)
+        user.update({
+            "name": rest["name"],
+            "bio": rest["bio"],
+            "avatarUrl": rest["avatar_url"],
+            "url": rest["html_url"],
+            "followers": {"totalCount": rest["followers"]},
+            "following": {"totalCount": rest["following"]},
+            "publicRepos": {"totalCount": rest["public_repos"]},
+            "gists": {"totalCount": rest["public_gists"]},
+        })
+    return user
+
+
+def create_app(config: Optional[FakeConfig] = None) -> FastAPI:
+    config = config or FakeConfig()
+    fake = FakeGitHub(config)
+    app = FastAPI()
+    app.state.fake = fake
+
+    def base(request: Request) -> str:
+        return str(request.base_url).rstrip("/")
+
+    @app.get("/users/{login}")
+    async def user(login: str, request: Request):
+        if login.startswith("missing"):
+            return await fake.respond(request, "user", {"message": "Not Found"}, status=404)
+        return await fake.respond(request, "user", _user(login, config, base(request)))
+
+    @app.get("/users/{login}/repos")
+    async def repos(login: str, request: Request, per_page: int = 30, page: int = 1):
+        start = (page - 1) * per_page
+        items: List[Dict[str, Any]] = [
+            _repo(login, index, config, base(request))
+            for index in range(start, min(config.repos, start + per_page))
+        ]
+        return await fake.respond(request, "repos_page", items)
+
+    @app.get("/repos/{owner}/{repo}/languages")
+    async def languages(owner: str, repo: str, request: Request):
+        return await fake.respond(request, "languages", _languages(owner, repo, config))
+
+    @app.post("/graphql")
+    async def graphql(request: Request):
+        variables = (await request.json()).get("variables") or {}
+        login = str(variables.get("login") or "")
+        if login.startswith("missing"):
+            payload = {"data": {"user": None}, "errors": [{"type": "NOT_FOUND", "message": "Not found"}]}
+        else:
+            payload = {"data": {"user": _graphql_user(login, variables, config, base(request))}}
+        return await fake.respond(request, "graphql", payload)
+
+    @app.get("/image.svg")
+    async def image():
+        fake.count("image", api_call=False)
+        await fake.delay()
+        return Response(IMAGE_SVG, media_type="image/svg+xml")
+
+    @app.get("/_stats")
+    async def stats():
+        return fake.stats()
+
+    @app.post("/_reset")
+    async def reset():
+        fake.reset()
+        return fake.stats()
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FakeConfig()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--repos", type=int, default=defaults.repos, help="public repos per user")
+    parser.add_argument("--languages", type=int, default=defaults.languages, help="languages per repo")
+    parser.add_argument("--rate-limit", type=int, default=defaults.rate_limit)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="0..1, answered with 502")
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    return FakeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        repos=args.repos,
+        languages=args.languages,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
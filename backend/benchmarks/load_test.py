@@ -0,0 +1,209 @@
+"""
+Load test against a local GitHub simulator.
+
+    cd backend
+    python -m benchmarks.load_test --concurrency 32 --requests 500 --users 50
+
+Starts benchmarks.fake_github and the API (uvicorn) as subprocesses, with
+GITHUB_API pointing at the simulator, then drives each scenario at the given
+concurrency and prints p50/p95/p99 latency, RPS, error count and GitHub calls
+per request (from the simulator's counters). ``--target http://host:port``
+skips starting the API and uses an already running one (it must point at the
+simulator started here, ``--fake-port``).
+
+Scenarios: profile (GET /api/profile), generate (POST /api/generate),
+proxy (GET /api/proxy-image of the simulator's /image.svg, allowed through
+IMAGE_PROXY_EXTRA_HOSTS).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks import fake_github
+
+SCENARIOS = ("profile", "generate", "proxy")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank
+    index = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+def _spawn(args: List[str], env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_ready(url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"{url} did not become ready in {timeout:.0f}s")
+
+
+def _request_factory(scenario: str, target: str, fake: str, users: int) -> Callable[[httpx.AsyncClient, int], Any]:
+    def username(i: int) -> str:
+        return f"user{i % users}"
+
+    if scenario == "profile":
+        return lambda client, i: client.get(f"{target}/api/profile/{username(i)}")
+    if scenario == "generate":
+        config = {"template": "professional", "layout": "table"}
+        return lambda client, i: client.post(f"{target}/api/generate", json={"username": username(i), "config": config})
+    image = f"{fake}/image.svg"
+    return lambda client, i: client.get(f"{target}/api/proxy-image", params={"url": f"{image}?n={i % users}"})
+
+
+async def run_scenario(
+    scenario: str,
+    target: str,
+    fake: str,
+    *,
+    requests: int,
+    concurrency: int,
+    users: int,
+) -> Dict[str, Any]:
+    make_request = _request_factory(scenario, target, fake, users)
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async with httpx.AsyncClient(timeout=60.0, limits=httpx.Limits(max_connections=concurrency)) as client:
+        before = (await client.get(f"{fake}/_stats")).json()["counts"].get("total", 0)
+
+        async def worker() -> None:
+            nonlocal errors
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    response = await make_request(client, i)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += failed
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        after = (await client.get(f"{fake}/_stats")).json()["counts"].get("total", 0)
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "github_per_request": (after - before) / requests if requests else 0.0,
+    }
+
+
+def _print(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['scenario']:<9} {result['requests']:>6} req  {result['errors']:>5} err  "
+        f"{result['rps']:8.1f} rps  p50 {result['p50']:8.1f} ms  p95 {result['p95']:8.1f} ms  "
+        f"p99 {result['p99']:8.1f} ms  {result['github_per_request']:6.2f} GitHub calls/req"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated: profile,generate,proxy")
+    parser.add_argument("--requests", type=int, default=300, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=30, help="distinct usernames cycled through")
+    parser.add_argument("--target", help="use an already running API instead of starting one")
+    parser.add_argument("--port", type=int, default=9000, help="port for the API started here")
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--backend", choices=("rest", "graphql"), default="rest")
+    parser.add_argument("--profile-cache-ttl", type=int, default=300, help="0 measures every request cold")
+    fake_github.add_arguments(parser)
+    args = parser.parse_args()
+
+    scenarios = [item.strip() for item in args.scenarios.split(",") if item.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake_args = [
+        "-m", "benchmarks.fake_github", "--port", str(args.fake_port),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--repos", str(args.repos), "--languages", str(args.languages),
+        "--rate-limit", str(args.rate_limit), "--error-rate", str(args.error_rate),
+    ]
+    processes = [_spawn(fake_args)]
+    try:
+        _wait_ready(f"{fake_url}/_stats")
+        target = args.target
+        if not target:
+            target = f"http://127.0.0.1:{args.port}"
+            env = {
+                "GITHUB_API": fake_url,
+                "GITHUB_FETCH_BACKEND": args.backend,
+                "PROFILE_CACHE_TTL": str(args.profile_cache_ttl),
+                "IMAGE_PROXY_EXTRA_HOSTS": f"127.0.0.1:{args.fake_port}",
+                "GITHUB_DISK_CACHE_PATH": "",
+            }
+            if args.backend == "graphql":
+                env["GITHUB_TOKEN"] = "fake-token"
+            processes.append(_spawn(
+                ["-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+                env,
+            ))
+            _wait_ready(f"{target}/api/rate-limit")
+
+        print(
+            f"fake GitHub: {args.latency_ms:.0f}ms latency, {args.repos} repos, {args.languages} languages/repo, "
+            f"error rate {args.error_rate:.2f}; {args.users} users, concurrency {args.concurrency}"
+        )
+        for scenario in scenarios:
+            httpx.post(f"{fake_url}/_reset")
+            result = asyncio.run(run_scenario(
+                scenario,
+                target,
+                fake_url,
+                requests=args.requests,
+                concurrency=args.concurrency,
+                users=args.users,
+            ))
+            _print(result)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,44 @@
-import { useMemo, useState } from 'react'
+import { useMemo, useRef, useState } from 'react'
 import type { FormEvent } from 'react'
-import ReactMarkdown from 'react-markdown'
-import rehypeRaw from 'rehype-raw'
 import './App.css'
 import {
+  fetchPreview,
+  fetchPreviewAssets,
   fetchProfile,
-  generateReadme,
-  type GeneratedReadme,
+  generateReadmeStream,
+  joinSections,
+  joinSectionsHtml,
   type ProfileData,
   type ReadmeConfig,
+  type ReadmePreview,
+  type ReadmeSection,
 } from './api'
 
-const IMAGE_PROXY_HOSTS = [
-  'github-readme-stats.vercel.app',
-  'github-readme-stats-fast.vercel.app',
-  'streak-stats.demolab.com',
-  'img.shields.io',
-]
+// El HTML del servidor ya apunta las imágenes permitidas al proxy: <img src="/api/proxy-image?url=…">
+const PROXIED_IMAGE_PATTERN = /<img src="\/api\/proxy-image\?url=([^"]+)"/g
 
-function imageSrcForPreview(src: string | undefined): string {
-  if (!src) return ''
-  try {
-    const u = new URL(src, window.location.origin)
-    if (IMAGE_PROXY_HOSTS.includes(u.hostname.toLowerCase())) {
-      return `/api/proxy-image?url=${encodeURIComponent(src)}`
-    }
-  } catch {
-    // URL inválida, devolver tal cual
+const proxiedUrl = (encoded: string) => decodeURIComponent(encoded.replace(/&amp;/g, '&'))
+
+// URLs originales de las imágenes del preview (se piden todas juntas a /api/preview-assets)
+function proxiedImageUrls(html: string): string[] {
+  const urls = new Set<string>()
+  for (const match of html.matchAll(PROXIED_IMAGE_PATTERN)) {
+    urls.add(proxiedUrl(match[1]))
   }
-  return src
+  return [...urls]
+}
+
+// GIF transparente de 1x1 mientras llega el bundle (sin petición al proxy)
+const PENDING_IMAGE = 'data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7'
+
+// Cada imagen del proxy pasa a su data URI del bundle; pendiente, placeholder; si el bundle falló (null), el proxy
+function withBundledImages(html: string, bundled: Record<string, string | null>): string {
+  return html.replace(PROXIED_IMAGE_PATTERN, (tag, encoded: string) => {
+    const url = proxiedUrl(encoded)
+    if (!(url in bundled)) return `<img class="image-pending" src="${PENDING_IMAGE}"`
+    const dataUri = bundled[url]
+    return dataUri ? `<img src="${dataUri}"` : tag
+  })
 }
 
 type SectionKey = 'header' | 'bio' | 'stats' | 'languages' | 'repos' | 'badges' | 'charts'
@@ -87,12 +97,12 @@ const formatBytes = (value?: number) => {
   return `${size.toFixed(precision)} ${units[unitIndex]}`
 }
 
-const getMarkdown = (result: GeneratedReadme | string) => {
+const getMarkdown = (result: ReadmePreview | string) => {
   if (typeof result === 'string') return result
   return result.markdown ?? ''
 }
 
-const getAssets = (result: GeneratedReadme | string) => {
+const getAssets = (result: ReadmePreview | string) => {
   if (typeof result === 'string') return null
   return result.assets ?? null
 }
@@ -105,7 +115,16 @@ function App() {
   const [generateLoading, setGenerateLoading] = useState(false)
   const [generateError, setGenerateError] = useState<string | null>(null)
   const [markdown, setMarkdown] = useState('')
+  // HTML saneado del servidor y el markdown al que corresponde (el editor puede cambiarlo)
+  const [previewHtml, setPreviewHtml] = useState('')
+  const [previewMarkdown, setPreviewMarkdown] = useState('')
+  const [previewLoading, setPreviewLoading] = useState(false)
   const [assets, setAssets] = useState<Record<string, string> | null>(null)
+  // URL original → data URI del bundle, o null si el bundle falló (se usa el proxy)
+  const [previewImages, setPreviewImages] = useState<Record<string, string | null>>({})
+  const imageRun = useRef(0)
+  const requestedImages = useRef(new Set<string>())
+  const queuedImages = useRef<string[]>([])
   const [theme, setTheme] = useState('light')
   const [layout, setLayout] = useState('default')
   const [template, setTemplate] = useState<TemplateId>('professional')
@@ -118,6 +137,11 @@ function App() {
 
   const trimmedUsername = username.trim()
 
+  const renderedPreview = useMemo(
+    () => withBundledImages(previewHtml, previewImages),
+    [previewHtml, previewImages],
+  )
+
   const selectedSections = useMemo(
     () =>
       SECTION_ORDER.filter((key) => sections[key]),
@@ -162,6 +186,41 @@ function App() {
     }
   }
 
+  const resetPreviewImages = () => {
+    imageRun.current += 1
+    requestedImages.current = new Set()
+    queuedImages.current = []
+    setPreviewImages({})
+  }
+
+  const loadPreviewImages = async (urls: string[], run: number) => {
+    // Si el bundle falla, esas imágenes caen al proxy individual
+    const bundle = await fetchPreviewAssets(urls).catch(() => null)
+    if (run !== imageRun.current) return
+    setPreviewImages((prev) => {
+      const next = { ...prev }
+      for (const url of urls) next[url] = bundle?.assets[url] ?? null
+      return next
+    })
+  }
+
+  // Pide al bundle las imágenes nuevas de este HTML; las secciones que llegan juntas van en una sola petición
+  const requestPreviewImages = (html: string) => {
+    const urls = proxiedImageUrls(html).filter((url) => !requestedImages.current.has(url))
+    if (!urls.length) return
+    urls.forEach((url) => requestedImages.current.add(url))
+    if (!queuedImages.current.length) {
+      const run = imageRun.current
+      queueMicrotask(() => {
+        if (run !== imageRun.current) return
+        const batch = queuedImages.current
+        queuedImages.current = []
+        void loadPreviewImages(batch, run)
+      })
+    }
+    queuedImages.current.push(...urls)
+  }
+
   const handleGenerate = async () => {
     if (!trimmedUsername) {
       setGenerateError('Ingresa un username valido.')
@@ -170,17 +229,33 @@ function App() {
     setGenerateLoading(true)
     setGenerateError(null)
     setCopyStatus(null)
+    // Las imágenes de la ejecución anterior no sirven: cada sección pide las suyas al llegar
+    resetPreviewImages()
     try {
-      const result = await generateReadme(trimmedUsername, config)
+      // Las secciones se muestran a medida que llegan; el evento final trae el README completo
+      const sections: ReadmeSection[] = []
+      const result = await generateReadmeStream(trimmedUsername, config, (section) => {
+        sections.push(section)
+        requestPreviewImages(section.html)
+        const partialMarkdown = joinSections(sections)
+        setMarkdown(partialMarkdown)
+        setPreviewMarkdown(partialMarkdown)
+        setPreviewHtml(joinSectionsHtml(sections))
+      })
       const nextMarkdown = getMarkdown(result)
       const nextAssets = getAssets(result)
       if (typeof nextMarkdown !== 'string') {
         setGenerateError('Respuesta sin markdown.')
         setMarkdown('')
+        setPreviewHtml('')
         setAssets(null)
         return
       }
+      // Normalmente ya pedidas por sección; cubre el fallback sin stream
+      requestPreviewImages(result.html)
       setMarkdown(nextMarkdown)
+      setPreviewMarkdown(nextMarkdown)
+      setPreviewHtml(result.html)
       setAssets(nextAssets && typeof nextAssets === 'object' ? nextAssets : null)
     } catch (error) {
       const message =
@@ -191,6 +266,31 @@ function App() {
     }
   }
 
+  // Vista previa del markdown editado: lo renderiza el servidor (/api/preview), no el navegador
+  const showPreview = async () => {
+    setPreviewViewMode('preview')
+    if (markdown === previewMarkdown) return
+    if (!markdown) {
+      setPreviewMarkdown('')
+      setPreviewHtml('')
+      return
+    }
+    setPreviewLoading(true)
+    setGenerateError(null)
+    try {
+      const result = await fetchPreview(trimmedUsername, config, markdown)
+      requestPreviewImages(result.html)
+      setPreviewMarkdown(markdown)
+      setPreviewHtml(result.html)
+    } catch (error) {
+      const message =
+        error instanceof Error ? error.message : 'Error al actualizar la vista previa.'
+      setGenerateError(message)
+    } finally {
+      setPreviewLoading(false)
+    }
+  }
+
   const handleCopy = async () => {
     if (!markdown) return
     if (!navigator.clipboard?.writeText) {
@@ -350,7 +450,13 @@ function App() {
               <button
                 type="button"
                 className="button secondary"
-                onClick={() => { setMarkdown(''); setAssets(null); setGenerateError(null) }}
+                onClick={() => {
+                  setMarkdown('')
+                  setPreviewMarkdown('')
+                  setPreviewHtml('')
+                  setAssets(null)
+                  setGenerateError(null)
+                }}
               >
                 Limpiar
               </button>
@@ -369,7 +475,7 @@ function App() {
                   role="tab"
                   aria-selected={previewViewMode === 'preview'}
                   className={previewViewMode === 'preview' ? 'tab active' : 'tab'}
-                  onClick={() => setPreviewViewMode('preview')}
+                  onClick={showPreview}
                 >
                   Vista previa
                 </button>
@@ -404,25 +510,11 @@ function App() {
 
           {previewViewMode === 'preview' && (
             <div className="preview-box">
-              {markdown ? (
-                <div className="markdown-body">
-                  <ReactMarkdown
-                    rehypePlugins={[rehypeRaw]}
-                    components={{
-                      img: ({ src, alt, ...props }) => (
-                        <img
-                          {...props}
-                          src={imageSrcForPreview(src)}
-                          alt={alt ?? ''}
-                          referrerPolicy="no-referrer"
-                          loading="lazy"
-                        />
-                      ),
-                    }}
-                  >
-                    {markdown}
-                  </ReactMarkdown>
-                </div>
+              {previewHtml ? (
+                // HTML saneado en el servidor (app/preview.py): solo etiquetas y URLs permitidas
+                <div className="markdown-body" dangerouslySetInnerHTML={{ __html: renderedPreview }} />
+              ) : previewLoading ? (
+                <p className="status empty">Actualizando vista previa…</p>
               ) : (
                 <p className="status empty">
                   Carga tu usuario y pulsa «Generar README» para ver la vista previa.
@@ -445,9 +537,10 @@ function App() {
               <button
                 type="button"
                 className="button primary btn-recompile"
-                onClick={() => setPreviewViewMode('preview')}
+                onClick={showPreview}
+                disabled={previewLoading}
               >
-                Actualizar vista previa
+                {previewLoading ? 'Actualizando…' : 'Actualizar vista previa'}
               </button>
             </div>
           )}
@@ -29,6 +29,24 @@ export type GeneratedReadme = {
   assets?: Record<string, string>
 }
 
+export type ReadmeSection = {
+  section: string
+  index: number
+  markdown: string
+  // HTML saneado por el servidor (mismo render que /api/preview)
+  html: string
+  assets?: Record<string, string>
+}
+
+export type ReadmePreview = GeneratedReadme & {
+  html: string
+}
+
+export type PreviewAssets = {
+  assets: Record<string, string>
+  errors: Record<string, { status: number; detail: string }>
+}
+
 const apiBase = ''
 
 const readErrorMessage = async (res: Response) => {
@@ -81,3 +99,93 @@ export const generateReadme = async (
   }
   return (await res.json()) as GeneratedReadme
 }
+
+// Une las secciones recibidas en el orden del README (igual que el markdown final)
+export const joinSections = (sections: ReadmeSection[]) => {
+  const parts = [...sections]
+    .sort((a, b) => a.index - b.index)
+    .map((section) => section.markdown)
+    .filter(Boolean)
+  return parts.length ? `${parts.join('\n\n')}\n` : ''
+}
+
+// Igual con el HTML de cada sección (el servidor renderiza cada bloque por separado)
+export const joinSectionsHtml = (sections: ReadmeSection[]) =>
+  [...sections]
+    .sort((a, b) => a.index - b.index)
+    .map((section) => section.html)
+    .filter(Boolean)
+    .join('\n')
+
+// Sin markdown se genera el README del usuario; con markdown (editado) se renderiza ese texto
+export const fetchPreview = async (
+  username: string,
+  config: ReadmeConfig,
+  markdown?: string,
+): Promise<ReadmePreview> => {
+  const res = await fetch(`${apiBase}/api/preview`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ username, config, markdown }),
+  })
+  if (!res.ok) {
+    throw new Error(await readErrorMessage(res))
+  }
+  return (await res.json()) as ReadmePreview
+}
+
+export const generateReadmeStream = async (
+  username: string,
+  config: ReadmeConfig,
+  onSection: (section: ReadmeSection) => void,
+): Promise<ReadmePreview> => {
+  const res = await fetch(`${apiBase}/api/generate/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify({ username, config }),
+  })
+  if (!res.ok) {
+    throw new Error(await readErrorMessage(res))
+  }
+  if (!res.body) {
+    return fetchPreview(username, config)
+  }
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    buffer += decoder.decode(value, { stream: !done })
+    let boundary = buffer.indexOf('\n\n')
+    while (boundary !== -1) {
+      const chunk = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      boundary = buffer.indexOf('\n\n')
+      let event = 'message'
+      let data = ''
+      for (const line of chunk.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) data += line.slice(5).trim()
+      }
+      if (!data) continue
+      const payload = JSON.parse(data)
+      if (event === 'section') onSection(payload as ReadmeSection)
+      else if (event === 'done') return payload as ReadmePreview
+      else if (event === 'error') throw new Error(payload?.detail ?? 'Error al generar README.')
+    }
+    if (done) break
+  }
+  throw new Error('La respuesta terminó sin el README completo.')
+}
+
+export const fetchPreviewAssets = async (urls: string[]): Promise<PreviewAssets> => {
+  const res = await fetch(`${apiBase}/api/preview-assets`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ urls }),
+  })
+  if (!res.ok) {
+    throw new Error(await readErrorMessage(res))
+  }
+  return (await res.json()) as PreviewAssets
+}